@@ -0,0 +1,88 @@
+# app/concurrency.py
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+class BlockingExecutor:
+    """
+    Runs blocking calls on a bounded thread pool so they never stall the event loop.
+    Concurrency is capped globally and per user, and every call has a timeout.
+    """
+    def __init__(self, max_workers: int, per_user_limit: int, timeout: float, name: str):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._global_semaphore = asyncio.Semaphore(max_workers)
+        self._per_user_limit = per_user_limit
+        self._user_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._user_refcounts: Dict[str, int] = {}
+
+    def _acquire_user(self, user_id: str) -> asyncio.Semaphore:
+        if user_id not in self._user_semaphores:
+            self._user_semaphores[user_id] = asyncio.Semaphore(self._per_user_limit)
+            self._user_refcounts[user_id] = 0
+        self._user_refcounts[user_id] += 1
+        return self._user_semaphores[user_id]
+
+    def _release_user(self, user_id: str) -> None:
+        self._user_refcounts[user_id] -= 1
+        # Drop idle users so the map does not grow with every user ever seen
+        if self._user_refcounts[user_id] == 0:
+            del self._user_refcounts[user_id]
+            del self._user_semaphores[user_id]
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        return max(deadline - asyncio.get_running_loop().time(), 0)
+
+    async def _run_in_pool(self, fn: Callable[..., T], deadline: float, *args, **kwargs) -> T:
+        await asyncio.wait_for(self._global_semaphore.acquire(), self._remaining(deadline))
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+            return await asyncio.wait_for(future, self._remaining(deadline))
+        finally:
+            self._global_semaphore.release()
+
+    async def run(self, user_id: Optional[str], fn: Callable[..., T], *args, timeout: Optional[float] = None, **kwargs) -> T:
+        """
+        Runs fn(*args, **kwargs) on the pool. Calls without a user_id are only
+        bound by the global limit. Raises asyncio.TimeoutError once the timeout
+        passes, counting time spent queued for a slot as well as time running.
+        """
+        deadline = asyncio.get_running_loop().time() + (timeout or self.timeout)
+        if user_id is None:
+            return await self._run_in_pool(fn, deadline, *args, **kwargs)
+
+        semaphore = self._acquire_user(user_id)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self._remaining(deadline))
+            try:
+                return await self._run_in_pool(fn, deadline, *args, **kwargs)
+            finally:
+                semaphore.release()
+        finally:
+            self._release_user(user_id)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+class SingleFlight:
+    """Collapses concurrent calls that share a key into one in-flight execution."""
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._forget(key, call))
+        # Shield so one cancelled caller does not cancel the call for everybody else
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
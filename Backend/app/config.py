@@ -10,6 +10,43 @@ class Settings(BaseSettings):
     jwt_secret: str
     EMAIL_ADDRESS: str
     EMAIL_PASSWORD: str
+    GMAIL_MAX_WORKERS: int = 16
+    GMAIL_USER_CONCURRENCY: int = 4
+    GMAIL_CALL_TIMEOUT: float = 30.0
+    GMAIL_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    GMAIL_CACHE_MAX_ENTRIES: int = 2000
+    GMAIL_CLIENT_CACHE_SIZE: int = 256
+    GMAIL_AUTH_CACHE_TTL: float = 300.0
+    GMAIL_AUTH_CACHE_SIZE: int = 10000
+    GMAIL_IMPORT_WORKERS: int = 2
+    GMAIL_IMPORT_HEARTBEAT_SECONDS: float = 30.0
+    GMAIL_IMPORT_STALE_SECONDS: float = 180.0  # An unfinished job without a heartbeat this long lost its instance
+    MATCH_INDEX_MAX_USERS: int = 500
+    MIME_MAX_BODY_CHARS: int = 200_000
+    MIME_PROCESS_POOL_THRESHOLD: int = 0  # 0 keeps extraction in-process
+    MIME_PROCESS_POOL_WORKERS: int = 2
+    SYNC_TOMBSTONE_TTL_SECONDS: int = 30 * 24 * 3600
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL: float = 60.0  # Bounds staleness across processes, which invalidate only locally
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on the next login when this changes
+    BCRYPT_MAX_WORKERS: int = 4
+    BCRYPT_TIMEOUT: float = 10.0
+    SMTP_HOST: str = "smtp.zoho.eu"
+    SMTP_PORT: int = 587
+    SMTP_STARTTLS: bool = True  # Off for a local SMTP stub; login is skipped when EMAIL_PASSWORD is empty
+    SMTP_TIMEOUT: float = 30.0
+    SMTP_IDLE_SECONDS: float = 60.0  # Reopen the pooled connection after this long unused
+    SMTP_BATCH_SIZE: int = 20
+    SMTP_MAX_ATTEMPTS: int = 6
+    SMTP_RETRY_BASE_SECONDS: float = 30.0
+    MAIL_OUTBOX_POLL_SECONDS: float = 30.0
+    MAIL_OUTBOX_TTL_SECONDS: int = 7 * 24 * 3600  # Counted from created_at, so failed and stuck rows expire too
+    AUTH_IP_RATE_PER_MINUTE: float = 30.0
+    AUTH_IP_BURST: int = 10
+    AUTH_EMAIL_RATE_PER_MINUTE: float = 5.0
+    AUTH_EMAIL_BURST: int = 5
+    AUTH_LIMITER_MAX_KEYS: int = 100_000
+    TRUST_FORWARDED_FOR: bool = False  # Only behind a proxy that sets X-Forwarded-For itself
 
     class Config:
         env_file = ".env"
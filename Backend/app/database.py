@@ -46,6 +46,73 @@ async def init_db():
         ("_id", 1)
     ])
     await db["applications"].create_index("user_id")
+    await db["applications"].create_index([
+        ("user_email", 1),
+        ("lastUpdated", -1),
+        ("_id", -1)
+    ])
+    await db["applications"].create_index([
+        ("user_email", 1),
+        ("dateApplied", 1)
+    ])
+    await db["applications"].create_index([
+        ("user_email", 1),
+        ("search_terms", 1)
+    ])
+    await db["applications"].create_index([
+        ("user_email", 1),
+        ("seq", 1)
+    ])
+    await db["applications"].create_index([
+        ("user_email", 1),
+        ("imported_id", 1)
+    ], sparse=True)
+    # Applications stored before versioning start at 0, so writes can always filter on the version
+    await db["applications"].update_many({"version": {"$exists": False}}, {"$set": {"version": 0}})
+    await db["emails"].create_index([
+        ("user_email", 1),
+        ("id", 1)
+    ])
+    await db["emails"].create_index([
+        ("user_email", 1),
+        ("seq", 1)
+    ])
+    await db["email_bodies"].create_index([
+        ("user_email", 1),
+        ("hash", 1)
+    ], unique=True)
+    await db["mail_outbox"].create_index([
+        ("status", 1),
+        ("next_attempt_at", 1)
+    ])
+    await db["mail_outbox"].create_index(
+        "created_at",
+        expireAfterSeconds=settings.MAIL_OUTBOX_TTL_SECONDS
+    )
+    await db["sync_tombstones"].create_index([
+        ("user_email", 1),
+        ("seq", 1)
+    ])
+    await db["sync_tombstones"].create_index(
+        "deleted_at",
+        expireAfterSeconds=settings.SYNC_TOMBSTONE_TTL_SECONDS
+    )
+    await db["gmail_import_jobs"].create_index([
+        ("user_id", 1),
+        ("created_at", -1)
+    ])
+    await db["gmail_import_jobs"].create_index([
+        ("status", 1),
+        ("heartbeat_at", 1)
+    ])
+    await db["gmail_message_cache"].create_index([
+        ("user_id", 1),
+        ("message_id", 1)
+    ], unique=True)
+    await db["gmail_message_cache"].create_index(
+        "cached_at",
+        expireAfterSeconds=settings.GMAIL_CACHE_TTL_SECONDS
+    )
 
 async def close_db():
     if db.client is not None:
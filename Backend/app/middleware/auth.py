@@ -3,11 +3,25 @@ from fastapi import Request, HTTPException
 import jwt
 import os
 from app.database import get_database
+from app.config import settings
+from app.cache import TTLCache
 from datetime import datetime
 
 JWT_SECRET = os.getenv("JWT_SECRET", "change_this_to_a_secure_random_value")
 JWT_ALGORITHM = "HS256"
 
+# Users that passed the checks below, keyed by (user_id, token_version)
+_user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
+
+def invalidate_user(user_id: str) -> None:
+    """Drops a user's cached entries; call after bumping token_version or deactivating the user."""
+    for key in _user_cache.keys():
+        if key[0] == user_id:
+            _user_cache.pop(key)
+
+def user_cache_stats() -> dict:
+    return _user_cache.stats()
+
 async def get_current_user(request: Request):
     auth_header = request.headers.get("Authorization")
     if not auth_header:
@@ -30,6 +44,10 @@ async def get_current_user(request: Request):
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    cached = _user_cache.get((user_id, token_version))
+    if cached is not None:
+        return dict(cached)
+
     db = await get_database()
     user = await db["users"].find_one({"id": user_id})
     if not user:
@@ -46,9 +64,11 @@ async def get_current_user(request: Request):
         raise HTTPException(status_code=401, detail="Token invalid due to password reset.")
 
     # Return user dict
-    return {
+    current_user = {
         "id": user["id"],
         "name": user.get("name"),
         "email": user.get("email"),
         "created_at": user.get("created_at")
-    }
\ No newline at end of file
+    }
+    _user_cache.set((user_id, token_version), current_user)
+    return dict(current_user)
\ No newline at end of file
@@ -0,0 +1,96 @@
+# app/middleware/rate_limit.py
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+from fastapi import HTTPException, Request
+from app.config import settings
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per key, refilling at rate tokens per second
+    up to burst. Buckets are kept in least recently used order: a bucket idle
+    long enough to be full again is dropped, and at most max_keys are kept.
+    Not thread-safe: use it from the event loop only.
+    """
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # After this long without requests a bucket is full, the same as a new one
+        self._idle_expiry = burst / rate
+        self._buckets: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        while self._buckets:
+            key, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < self._idle_expiry and len(self._buckets) < self.max_keys:
+                break
+            del self._buckets[key]
+
+    def _refill(self, key: Hashable) -> float:
+        now = time.monotonic()
+        self._expire(now)
+        tokens, last_seen = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last_seen) * self.rate)
+        self._buckets[key] = (tokens, now)
+        return tokens
+
+    def wait_time(self, key: Hashable) -> float:
+        """Returns 0 when key has a token, otherwise the seconds until it has one. Takes nothing."""
+        tokens = self._refill(key)
+        return 0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self, key: Hashable) -> None:
+        """Takes a token for key; only call it after wait_time returned 0."""
+        tokens = self._refill(key)
+        self._buckets[key] = (tokens - 1, self._buckets[key][1])
+
+    def acquire(self, key: Hashable) -> float:
+        """Takes a token for key. Returns 0 when admitted, otherwise the seconds until a token is available."""
+        retry_after = self.wait_time(key)
+        if not retry_after:
+            self.take(key)
+        return retry_after
+
+ip_limiter = TokenBucketLimiter(
+    rate=settings.AUTH_IP_RATE_PER_MINUTE / 60,
+    burst=settings.AUTH_IP_BURST,
+    max_keys=settings.AUTH_LIMITER_MAX_KEYS
+)
+email_limiter = TokenBucketLimiter(
+    rate=settings.AUTH_EMAIL_RATE_PER_MINUTE / 60,
+    burst=settings.AUTH_EMAIL_BURST,
+    max_keys=settings.AUTH_LIMITER_MAX_KEYS
+)
+
+def client_ip(request: Request) -> str:
+    if settings.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def _reject(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many requests, please try again later.",
+        headers={"Retry-After": str(math.ceil(retry_after))}
+    )
+
+def admit(request: Request, email: Optional[str] = None) -> None:
+    """
+    Admission control for expensive auth endpoints: raises 429 with Retry-After
+    once the client IP or the account email runs out of tokens. Both buckets are
+    checked before either is charged.
+    """
+    ip = client_ip(request)
+    retry_after = ip_limiter.wait_time(ip)
+    if email:
+        retry_after = max(retry_after, email_limiter.wait_time(email.lower()))
+    if retry_after:
+        raise _reject(retry_after)
+    # Charged only once both buckets admit, so a request refused for one does not drain the other
+    ip_limiter.take(ip)
+    if email:
+        email_limiter.take(email.lower())
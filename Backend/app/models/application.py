@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 from bson import ObjectId
 
 class ApplicationLog(BaseModel):
@@ -12,7 +12,8 @@ class ApplicationLog(BaseModel):
     source: str
     emailId: Optional[str] = None
     emailTitle: Optional[str] = None
-    emailBody: Optional[str] = None
+    emailBody: Optional[str] = None  # Only inline on the way in and from GET /{id}/logs
+    emailBodyRef: Optional[str] = None  # Hash of the body in the email body store
 
 class Application(BaseModel):
     id: str = Field(default_factory=lambda: str(ObjectId()))
@@ -30,6 +31,7 @@ class Application(BaseModel):
     location: Optional[str] = None
     notes: Optional[str] = None
     logs: List[ApplicationLog] = []
+    version: int = 0  # Bumped on every write, used for optimistic concurrency
     
     model_config = {
         "json_schema_extra": {
@@ -45,4 +47,102 @@ class Application(BaseModel):
                 "user_email": "abc@gmail.com",
             }
         }
-    }
\ No newline at end of file
+    }
+
+ApplicationList = TypeAdapter(List[Application])
+
+class ApplicationSummary(BaseModel):
+    """Board view of an application: no logs and no long text fields."""
+    id: str
+    user_id: str
+    user_email: EmailStr
+    company: str
+    position: str
+    dateApplied: datetime
+    stage: str
+    type: str
+    tags: List[str]
+    lastUpdated: datetime
+    salary: Optional[str] = None
+    location: Optional[str] = None
+    version: int = 0
+
+ApplicationSummaryList = TypeAdapter(List[ApplicationSummary])
+
+class ApplicationPatch(BaseModel):
+    """
+    Field-level update: only the fields present in the request are written.
+    version must match the stored version, otherwise the patch is rejected.
+    """
+    version: int = Field(ge=0)
+    company: Optional[str] = None
+    position: Optional[str] = None
+    dateApplied: Optional[datetime] = None
+    stage: Optional[str] = None
+    type: Optional[str] = None
+    tags: Optional[List[str]] = None
+    lastUpdated: Optional[datetime] = None
+    description: Optional[str] = None
+    salary: Optional[str] = None
+    location: Optional[str] = None
+    notes: Optional[str] = None
+    appendLogs: List[ApplicationLog] = []
+
+class ApplicationSearchResult(BaseModel):
+    score: float
+    application: ApplicationSummary
+
+class ApplicationPage(BaseModel):
+    items: List[Union[Application, ApplicationSummary]]
+    nextCursor: Optional[str] = None
+
+ApplicationPageAdapter = TypeAdapter(ApplicationPage)
+
+class ImportRowError(BaseModel):
+    row: int  # Line number in the uploaded file
+    error: str
+
+class ApplicationImportResult(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+
+
+class BulkCreate(BaseModel):
+    op: Literal["create"]
+    application: Application
+
+class BulkMoveStage(BaseModel):
+    op: Literal["move_stage"]
+    id: str
+    stage: str
+    log: Optional[ApplicationLog] = None
+
+class BulkAddTag(BaseModel):
+    op: Literal["add_tag"]
+    id: str
+    tag: str
+
+class BulkRemoveTag(BaseModel):
+    op: Literal["remove_tag"]
+    id: str
+    tag: str
+
+class BulkDelete(BaseModel):
+    op: Literal["delete"]
+    id: str
+
+BulkOperation = Annotated[
+    Union[BulkCreate, BulkMoveStage, BulkAddTag, BulkRemoveTag, BulkDelete],
+    Field(discriminator="op")
+]
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation] = Field(..., max_length=1000)
+
+class BulkItemResult(BaseModel):
+    index: int
+    op: str
+    status: Literal["ok", "not_found", "error"]
+    id: Optional[str] = None
+    error: Optional[str] = None
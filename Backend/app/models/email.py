@@ -1,7 +1,7 @@
 # app/models/email.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class Email(BaseModel):
     id: Optional[str] = None
@@ -13,5 +13,28 @@ class Email(BaseModel):
     date: datetime
     processed: bool = False
 
+EmailList = TypeAdapter(List[Email])
+
 class EmailProcessRequest(BaseModel):
-    email_ids: List[str]
\ No newline at end of file
+    email_ids: List[str]
+
+class EmailMatchInput(BaseModel):
+    id: Optional[str] = None
+    subject: str
+    sender: str
+    body: str = ""
+
+class EmailMatchRequest(BaseModel):
+    emails: List[EmailMatchInput] = Field(..., max_length=200)
+    top_k: int = Field(5, ge=1, le=50)
+
+class ApplicationMatch(BaseModel):
+    application_id: str
+    company: str
+    position: str
+    score: float
+    reasons: Dict[str, float]  # Contribution of each signal: domain, company, position
+
+class EmailMatchResult(BaseModel):
+    email_id: Optional[str] = None
+    matches: List[ApplicationMatch]
@@ -1,5 +1,5 @@
 # app/models/gmail.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -9,6 +9,7 @@ class GmailCredentials(BaseModel):
     refresh_token: str
     token_expiry: datetime
     email: str
+    history_id: Optional[str] = None  # Cursor for incremental sync
 
 class GmailFetchParams(BaseModel):
     tags: Optional[List[str]] = None
@@ -17,8 +18,21 @@ class GmailFetchParams(BaseModel):
     search_query: Optional[str] = None
     limit: int = 20
     page_token: Optional[str] = None  # Add page token
+    batch_size: int = 50  # Messages per Gmail batch request; 1 fetches sequentially
 
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat() if v else None
-        }
\ No newline at end of file
+        }
+
+class GmailDetailsRequest(BaseModel):
+    message_ids: List[str]
+    batch_size: int = 50
+
+class GmailImportJobRequest(BaseModel):
+    tags: Optional[List[str]] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    search_query: Optional[str] = None
+    max_messages: int = Field(500, ge=1, le=5000)
+    page_size: int = Field(50, ge=1, le=100)
@@ -0,0 +1,22 @@
+# app/models/sync.py
+from pydantic import BaseModel, TypeAdapter
+from typing import List
+from .application import Application
+from .email import Email
+
+class ApplicationChanges(BaseModel):
+    reset: bool = False  # Drop every local application before applying the changes
+    upserted: List[Application] = []
+    deleted: List[str] = []
+
+class EmailChanges(BaseModel):
+    reset: bool = False  # Drop every local email before applying the changes
+    upserted: List[Email] = []
+    deleted: List[str] = []
+
+class SyncChanges(BaseModel):
+    token: str  # Pass back as since on the next sync
+    applications: ApplicationChanges
+    emails: EmailChanges
+
+SyncChangesAdapter = TypeAdapter(SyncChanges)
@@ -1,5 +1,5 @@
 # app/models/workflow.py
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, TypeAdapter
 from typing import List, Optional
 from bson import ObjectId
 
@@ -31,4 +31,6 @@ class Workflow(BaseModel):
                 "default": True
             }
         }
-    }
\ No newline at end of file
+    }
+
+WorkflowList = TypeAdapter(List[Workflow])
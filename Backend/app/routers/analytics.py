@@ -0,0 +1,25 @@
+# app/routers/analytics.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from datetime import datetime, timedelta
+from ..services.analytics_service import AnalyticsService
+from ..middleware.auth import get_current_user
+
+router = APIRouter()
+analytics_service = AnalyticsService()
+
+@router.get("/summary")
+async def get_analytics_summary(
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """Funnel, stage counts, type distribution, response rates and transition times for a date range"""
+    try:
+        start_date_obj = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        # end_date is inclusive, so take everything before the next day
+        end_date_obj = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) if end_date else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await analytics_service.get_summary(current_user, start_date_obj, end_date_obj)
@@ -1,16 +1,102 @@
 # backend/app/routers/applications.py
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+from typing import List, Literal, Optional
 from app.middleware.auth import get_current_user
-from ..models.application import Application
+from ..models.application import (
+    Application, ApplicationImportResult, ApplicationList, ApplicationLog, ApplicationPage, ApplicationPageAdapter, ApplicationPatch,
+    ApplicationSearchResult, ApplicationSummary, BulkItemResult, BulkRequest
+)
 from ..services.application_service import ApplicationService
+from ..serialization import etag_headers, json_response, not_modified
 
 router = APIRouter()
 application_service = ApplicationService()
 
 @router.get("/", response_model=List[Application])
-async def get_applications(current_user: dict = Depends(get_current_user)):
-    return await application_service.get_all(current_user["email"])
+async def get_applications(request: Request, current_user: dict = Depends(get_current_user)):
+    """Carries an ETag; a matching If-None-Match gets 304 without reading the applications"""
+    # Read before the data, so a concurrent write can only make the tag stale, never too new
+    etag = await application_service.data_versions.etag(current_user["email"])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    applications = await application_service.get_all(current_user["email"])
+    return json_response(ApplicationList, applications, headers=etag_headers(etag))
+
+@router.get("/page", response_model=ApplicationPage)
+async def get_applications_page(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    stage: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    view: Literal["board", "full"] = Query("board"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Returns {items, nextCursor}; pass nextCursor back to get the following page"""
+    try:
+        page = await application_service.get_page(
+            current_user["email"], limit=limit, cursor=cursor, stage=stage, type=type, tag=tag, view=view
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(ApplicationPageAdapter, page)
+
+@router.get("/search", response_model=List[ApplicationSearchResult])
+async def search_applications(
+    q: str = Query(..., min_length=1),
+    stage: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Ranked prefix search over company, position, tags, location and notes"""
+    try:
+        start_date_obj = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_date_obj = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) if end_date else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await application_service.search(
+        current_user["email"], q, stage=stage, start_date=start_date_obj, end_date=end_date_obj, limit=limit
+    )
+
+@router.get("/export")
+async def export_applications(
+    format: Literal["csv", "ndjson"] = Query("ndjson"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Full backup as NDJSON (with logs) or CSV for spreadsheets, streamed"""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        application_service.export(current_user["email"], format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="applications.{format}"'}
+    )
+
+@router.post("/import", response_model=ApplicationImportResult)
+async def import_applications(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """Imports a CSV or NDJSON file (format taken from the file name if not given), reporting errors per row"""
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    return await application_service.import_file(file.file, format, current_user)
+
+@router.get("/{application_id}/logs", response_model=List[ApplicationLog])
+async def get_application_logs(
+    application_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    logs = await application_service.get_logs(application_id, current_user["email"])
+    if logs is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return logs
 
 @router.get("/{application_id}", response_model=Application)
 async def get_application(
@@ -29,6 +115,14 @@ async def create_application(
 ):
     return await application_service.create(application, current_user)
 
+@router.post("/bulk", response_model=List[BulkItemResult])
+async def bulk_applications(
+    request: BulkRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Creates, moves, tags and deletes many applications in one round trip"""
+    return await application_service.bulk(request.operations, current_user)
+
 @router.put("/{application_id}", response_model=Application)
 async def update_application(
     application_id: str,
@@ -40,6 +134,17 @@ async def update_application(
         raise HTTPException(status_code=404, detail="Application not found")
     return updated
 
+@router.patch("/{application_id}", response_model=ApplicationSummary)
+async def patch_application(
+    application_id: str,
+    patch: ApplicationPatch,
+    current_user: dict = Depends(get_current_user)
+):
+    updated = await application_service.patch(application_id, patch, current_user["email"])
+    if not updated:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return updated
+
 @router.delete("/{application_id}")
 async def delete_application(
     application_id: str,
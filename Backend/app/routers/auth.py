@@ -1,6 +1,7 @@
 # app/routers/auth.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.middleware.auth import get_current_user
+from app.middleware.rate_limit import admit
 from app.models.auth import LoginRequest, RegisterRequest
 from app.services.auth_service import AuthService
 from pydantic import BaseModel
@@ -15,11 +16,13 @@ class FinishResetPasswordRequest(BaseModel):
     new_password: str
 
 @router.post("/register")
-async def register(data: RegisterRequest):
+async def register(data: RegisterRequest, request: Request):
+    admit(request, data.email)
     return await AuthService.register(data)
 
 @router.post("/login")
-async def login(data: LoginRequest):
+async def login(data: LoginRequest, request: Request):
+    admit(request, data.email)
     return await AuthService.login(data)
 
 @router.post("/logout")
@@ -27,11 +30,13 @@ async def logout():
     return await AuthService.logout()
 
 @router.post("/forgot-password")
-async def forgot_password(data: PasswordResetRequest):
+async def forgot_password(data: PasswordResetRequest, request: Request):
+    admit(request, data.email)
     return await AuthService.request_password_reset(data.email)
 
 @router.post("/reset-password")
-async def reset_password(data: FinishResetPasswordRequest):
+async def reset_password(data: FinishResetPasswordRequest, request: Request):
+    admit(request)
     return await AuthService.reset_password(data.token, data.new_password)
 
 @router.get("/check-auth")
@@ -1,16 +1,20 @@
 # app/routers/email.py
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-from ..models.email import Email, EmailProcessRequest
+from ..models.email import Email, EmailList, EmailProcessRequest, EmailMatchRequest, EmailMatchResult
 from ..services.email_service import EmailService
+from ..services.matching_service import MatchingService
 from ..middleware.auth import get_current_user  # Import the auth middleware
+from ..serialization import json_response
 
 router = APIRouter()
 email_service = EmailService()
+matching_service = MatchingService()
 
 @router.get("/", response_model=List[Email])
 async def get_emails(current_user: dict = Depends(get_current_user)):
-    return await email_service.get_all(current_user)
+    emails = await email_service.get_all(current_user)
+    return json_response(EmailList, emails)
 
 @router.post("/", response_model=Email)
 async def create_email(
@@ -19,6 +23,14 @@ async def create_email(
 ):
     return await email_service.create(email, current_user)
 
+@router.post("/match", response_model=List[EmailMatchResult])
+async def match_emails(
+    request: EmailMatchRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Top-k candidate applications for each email, scored server-side"""
+    return await matching_service.match(current_user["email"], request.emails, request.top_k)
+
 @router.post("/process")
 async def process_emails(
     request: EmailProcessRequest,
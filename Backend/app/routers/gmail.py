@@ -1,18 +1,22 @@
 # app/routers/gmail.py
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 from app.utils import create_jwt_for_user
 from app.database import get_database
 from google_auth_oauthlib.flow import Flow
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
-from ..models.gmail import GmailFetchParams
+from ..models.gmail import GmailFetchParams, GmailDetailsRequest, GmailImportJobRequest
 from ..services.gmail_service import GmailService
+from ..services.gmail_import_service import GmailImportService
 from app.config import settings
 from ..middleware.auth import get_current_user
 
 router = APIRouter()
 gmail_service = GmailService()
+gmail_import_service = GmailImportService(gmail_service)
 
 @router.get("/auth/url")
 async def get_auth_url():
@@ -60,16 +64,37 @@ async def check_auth(current_user: dict = Depends(get_current_user)):
     result = await gmail_service.check_auth(current_user["id"])
     return result
 
-@router.get("/emails")
-async def get_gmail_emails(
+@router.post("/sync")
+async def sync_new_emails(
+    limit: int = Query(50, ge=1, le=500),
+    batch_size: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Returns only mail that arrived since the previous sync. A POST, since it moves the stored cursor"""
+    try:
+        return await gmail_service.sync_new_emails(
+            user_id=current_user["id"],
+            user_email=current_user["email"],
+            limit=limit,
+            batch_size=batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gmail did not respond in time")
+    except Exception as e:
+        print(f"Error syncing Gmail emails: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to sync emails from Gmail")
+
+def get_fetch_params(
     tags: Optional[List[str]] = Query(...),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     search_query: Optional[str] = Query(""),
     limit: int = Query(20),
     page_token: Optional[str] = Query(None),
-    current_user: dict = Depends(get_current_user)
-):
+    batch_size: int = Query(50, ge=1, le=100)
+) -> GmailFetchParams:
     try:
         start_date_obj = None
         end_date_obj = None
@@ -77,16 +102,25 @@ async def get_gmail_emails(
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
         if end_date:
             end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        params = GmailFetchParams(
-            tags=tags,
-            start_date=start_date_obj,
-            end_date=end_date_obj,
-            search_query=search_query,
-            limit=limit,
-            page_token=page_token
-        )
+    return GmailFetchParams(
+        tags=tags,
+        start_date=start_date_obj,
+        end_date=end_date_obj,
+        search_query=search_query,
+        limit=limit,
+        page_token=page_token,
+        batch_size=batch_size
+    )
 
+@router.get("/emails")
+async def get_gmail_emails(
+    params: GmailFetchParams = Depends(get_fetch_params),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
         result = await gmail_service.fetch_emails(
             user_id=current_user["id"],
             user_email=current_user["email"],
@@ -97,6 +131,104 @@ async def get_gmail_emails(
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gmail did not respond in time")
+    except Exception as e:
+        print(f"Error fetching Gmail emails: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch emails from Gmail")
+
+@router.get("/emails/stream")
+async def stream_gmail_emails(
+    params: GmailFetchParams = Depends(get_fetch_params),
+    format: Literal["ndjson", "sse"] = Query("ndjson"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Streams each parsed email as soon as it is ready, a "failed" frame per message
+    that could not be fetched, then a final frame with nextPageToken. An "error"
+    frame means the stream itself broke off.
+    """
+    try:
+        frames = await gmail_service.open_email_stream(
+            user_id=current_user["id"],
+            user_email=current_user["email"],
+            params=params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gmail did not respond in time")
     except Exception as e:
         print(f"Error fetching Gmail emails: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch emails from Gmail")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch emails from Gmail")
+
+    async def encode():
+        try:
+            async for frame in frames:
+                if format == "sse":
+                    yield f"event: {frame['type']}\ndata: {json.dumps(frame)}\n\n"
+                else:
+                    yield json.dumps(frame) + "\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            print(f"Error streaming Gmail emails: {str(e)}")
+            error = {"type": "error", "error": "Failed to fetch emails from Gmail"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n" if format == "sse" else json.dumps(error) + "\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(encode(), media_type=media_type)
+
+@router.get("/emails/summaries")
+async def get_gmail_email_summaries(
+    params: GmailFetchParams = Depends(get_fetch_params),
+    current_user: dict = Depends(get_current_user)
+):
+    """Lightweight listing for the import modal; bodies are fetched through /emails/details"""
+    try:
+        return await gmail_service.list_email_summaries(current_user["id"], params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gmail did not respond in time")
+    except Exception as e:
+        print(f"Error listing Gmail emails: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list emails from Gmail")
+
+@router.post("/emails/details")
+async def get_gmail_email_details(
+    request: GmailDetailsRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        return await gmail_service.fetch_email_details(
+            user_id=current_user["id"],
+            user_email=current_user["email"],
+            message_ids=request.message_ids,
+            batch_size=request.batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Gmail did not respond in time")
+    except Exception as e:
+        print(f"Error fetching Gmail email details: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch emails from Gmail")
+
+
+@router.post("/import-jobs", status_code=202)
+async def create_import_job(
+    request: GmailImportJobRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Queues a background import and returns its job id right away"""
+    return await gmail_import_service.submit(request, current_user)
+
+@router.get("/import-jobs/{job_id}")
+async def get_import_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    job = await gmail_import_service.get(job_id, current_user)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
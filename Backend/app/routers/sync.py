@@ -0,0 +1,22 @@
+# app/routers/sync.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from ..models.sync import SyncChanges, SyncChangesAdapter
+from ..services.sync_service import SyncService
+from ..middleware.auth import get_current_user
+from ..serialization import json_response
+
+router = APIRouter()
+sync_service = SyncService()
+
+@router.get("/changes", response_model=SyncChanges)
+async def get_changes(
+    since: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """Applications and emails changed since the token of the previous sync; omit since for a full sync"""
+    try:
+        changes = await sync_service.changes(current_user["email"], since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(SyncChangesAdapter, changes)
@@ -1,16 +1,19 @@
 # app/routers/workflow.py
-from fastapi import APIRouter, HTTPException, Body, Depends
+from fastapi import APIRouter, HTTPException, Body, Depends, Request
+from fastapi.responses import Response
 from typing import List
-from ..models.workflow import Workflow, WorkflowStage
+from ..models.workflow import Workflow, WorkflowList, WorkflowStage
 from ..services.workflow_service import WorkflowService
 from ..middleware.auth import get_current_user
+from ..serialization import etag_headers, json_response, not_modified
 
 router = APIRouter()
 workflow_service = WorkflowService()
 
 @router.get("/", response_model=List[Workflow])
 async def get_workflows(current_user: dict = Depends(get_current_user)):
-    return await workflow_service.get_all(current_user)
+    workflows = await workflow_service.get_all(current_user)
+    return json_response(WorkflowList, workflows)
 
 @router.post("/", response_model=Workflow)
 async def create_workflow(
@@ -23,13 +26,21 @@ async def create_workflow(
     return created_workflow
 
 @router.get("/default", response_model=Workflow)
-async def get_default_workflow(current_user: dict = Depends(get_current_user)):
+async def get_default_workflow(request: Request, current_user: dict = Depends(get_current_user)):
+    """Carries an ETag; a matching If-None-Match gets 304 without reading the workflow"""
+    etag = await workflow_service.data_versions.etag(current_user["email"])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     workflow = await workflow_service.get_default(current_user)
     if not workflow:
         workflow = await workflow_service.create_initial_workflow(current_user)
         if not workflow:
             raise HTTPException(status_code=500, detail="Failed to create default workflow")
-    return workflow
+        etag = await workflow_service.data_versions.etag(current_user["email"])
+    return Response(
+        content=workflow.model_dump_json(), headers=etag_headers(etag), media_type="application/json"
+    )
 
 @router.get("/{workflow_id}", response_model=Workflow)
 async def get_workflow(
@@ -0,0 +1,39 @@
+# app/serialization.py
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+# Clients may cache, but must revalidate with If-None-Match before reusing
+REVALIDATE = "private, no-cache"
+
+def with_ids(docs: List[dict]) -> List[dict]:
+    """Exposes each Mongo _id as id in place; models ignore the leftover _id."""
+    for doc in docs:
+        doc["id"] = str(doc["_id"])
+    return docs
+
+def json_response(
+    adapter: TypeAdapter, value: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Encodes already validated data with pydantic-core, so FastAPI does not
+    validate and serialize it a second time through response_model.
+    """
+    return Response(
+        content=adapter.dump_json(value), status_code=status_code, headers=headers, media_type="application/json"
+    )
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # The body depends on who asks, so caches must key it on the credentials too
+    return {"ETag": etag, "Cache-Control": REVALIDATE, "Vary": "Authorization"}
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Returns a 304 response when the request's If-None-Match already matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
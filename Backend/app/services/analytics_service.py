@@ -0,0 +1,134 @@
+# app/services/analytics_service.py
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+from ..database import get_database
+from .workflow_service import WorkflowService
+
+MS_PER_DAY = 1000 * 60 * 60 * 24
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class AnalyticsService:
+    """
+    Dashboard metrics computed by MongoDB aggregation pipelines over the
+    applications collection, so only small aggregates leave the database.
+    """
+    def __init__(self):
+        self.collection_name = "applications"
+        self.workflow_service = WorkflowService()
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    def _match(self, user_email: str, start_date: Optional[datetime], end_date: Optional[datetime]) -> dict:
+        match = {"user_email": user_email}
+        if start_date or end_date:
+            match["dateApplied"] = {}
+            if start_date:
+                match["dateApplied"]["$gte"] = start_date
+            if end_date:
+                match["dateApplied"]["$lt"] = end_date
+        return match
+
+    async def _stage_order(self, user: Dict) -> List[str]:
+        workflow = await self.workflow_service.get_default(user)
+        if not workflow:
+            return []
+        names = {stage.id: stage.name for stage in workflow.stages}
+        return [names[stage_id] for stage_id in workflow.stage_order if stage_id in names]
+
+    async def get_summary(self, user: Dict, start_date: Optional[datetime], end_date: Optional[datetime]) -> dict:
+        collection = await self.get_collection()
+        match = self._match(user["email"], start_date, end_date)
+
+        facets = await collection.aggregate([
+            {"$match": match},
+            {"$facet": {
+                "total": [{"$count": "value"}],
+                "stages": [{"$group": {"_id": "$stage", "value": {"$sum": 1}}}],
+                "types": [{"$group": {"_id": "$type", "value": {"$sum": 1}}}],
+                # An application reached every stage it is in or was ever moved to
+                "reached": [
+                    {"$project": {"reached": {"$setUnion": [["$stage"], {"$ifNull": ["$logs.toStage", []]}]}}},
+                    {"$unwind": "$reached"},
+                    {"$group": {"_id": "$reached", "value": {"$sum": 1}}}
+                ],
+                "rates": [{"$group": {
+                    "_id": None,
+                    "responded": {"$sum": {"$cond": [{"$ne": ["$stage", "Resume Submitted"]}, 1, 0]}},
+                    "interviewed": {"$sum": {"$cond": [{"$eq": ["$stage", "Interview Process"]}, 1, 0]}},
+                    "offered": {"$sum": {"$cond": [{"$eq": ["$stage", "Offer"]}, 1, 0]}}
+                }}]
+            }}
+        ]).to_list(1)
+        facet = facets[0]
+        total = facet["total"][0]["value"] if facet["total"] else 0
+
+        reached = {row["_id"]: row["value"] for row in facet["reached"]}
+        stage_order = await self._stage_order(user)
+        funnel_stages = stage_order or sorted(reached, key=reached.get, reverse=True)
+
+        rates = facet["rates"][0] if facet["rates"] else {"responded": 0, "interviewed": 0, "offered": 0}
+
+        def rate(count: int) -> float:
+            return round(count / total * 100, 2) if total else 0
+
+        return {
+            "total": total,
+            "stages": [{"name": row["_id"], "value": row["value"]} for row in facet["stages"]],
+            "types": [{"name": row["_id"], "value": row["value"]} for row in facet["types"]],
+            "funnel": [
+                {"stage": stage, "count": reached.get(stage, 0), "rate": rate(reached.get(stage, 0))}
+                for stage in funnel_stages
+            ],
+            "responseRates": [
+                {"name": "Response Rate", "value": rate(rates["responded"])},
+                {"name": "Interview Rate", "value": rate(rates["interviewed"])},
+                {"name": "Offer Rate", "value": rate(rates["offered"])}
+            ],
+            "transitions": await self.get_transition_times(user["email"], start_date, end_date)
+        }
+
+    async def get_transition_times(
+        self, user_email: str, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> List[dict]:
+        """Days between consecutive logs of an application, grouped by (from stage, to stage)."""
+        collection = await self.get_collection()
+        rows = await collection.aggregate([
+            {"$match": self._match(user_email, start_date, end_date)},
+            {"$project": {"logs.toStage": 1, "logs.date": 1}},
+            {"$unwind": "$logs"},
+            {"$setWindowFields": {
+                "partitionBy": "$_id",
+                "sortBy": {"logs.date": 1},
+                "output": {
+                    "previousStage": {"$shift": {"output": "$logs.toStage", "by": -1}},
+                    "previousDate": {"$shift": {"output": "$logs.date", "by": -1}}
+                }
+            }},
+            {"$match": {"previousDate": {"$ne": None}, "$expr": {"$ne": ["$previousStage", "$logs.toStage"]}}},
+            {"$group": {
+                "_id": {"from": "$previousStage", "to": "$logs.toStage"},
+                "days": {"$push": {"$divide": [{"$subtract": ["$logs.date", "$previousDate"]}, MS_PER_DAY]}}
+            }}
+        ]).to_list(None)
+
+        transitions = []
+        for row in rows:
+            days = sorted(row["days"])
+            transitions.append({
+                "fromStage": row["_id"]["from"],
+                "toStage": row["_id"]["to"],
+                "count": len(days),
+                "meanDays": round(sum(days) / len(days), 2),
+                "medianDays": round(_percentile(days, 0.5), 2),
+                "p90Days": round(_percentile(days, 0.9), 2)
+            })
+        return sorted(transitions, key=lambda t: t["count"], reverse=True)
@@ -1,12 +1,110 @@
 # backend/app/services/application_service.py
+import base64
+import csv
+import io
+import json
+import re
 from bson import ObjectId
-from typing import List, Optional
-from ..models.application import Application
+from bson.errors import InvalidId
+from datetime import datetime
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from itertools import islice
+from pydantic import ValidationError
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import AsyncIterator, BinaryIO, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+from ..models.application import (
+    Application, ApplicationImportResult, ApplicationList, ApplicationLog, ApplicationPage, ApplicationPatch, ApplicationSearchResult,
+    ApplicationSummary, ApplicationSummaryList, BulkCreate, BulkDelete, BulkItemResult, BulkMoveStage, BulkOperation,
+    ImportRowError
+)
 from ..database import get_database
+from ..serialization import with_ids
+from .data_version_service import DataVersionService
+from .sync_service import SyncService
+from .email_body_service import EmailBodyService, body_ref
+
+# Fields left out of board views; the full record is available per application
+BOARD_PROJECTION = {"logs": 0, "description": 0, "notes": 0}
+
+# Searchable fields and how much a match in each counts towards the rank
+SEARCH_WEIGHTS = {"company": 5.0, "position": 4.0, "tags": 3.0, "location": 2.0, "notes": 1.0}
+SEARCH_TOKEN = re.compile(r"\w+")
+# Matches considered before ranking; keeps a search bounded on broad prefixes
+MAX_SEARCH_CANDIDATES = 500
+
+def _tokens(value) -> Set[str]:
+    if not value:
+        return set()
+    text = " ".join(value) if isinstance(value, list) else value
+    return set(SEARCH_TOKEN.findall(text.lower()))
+
+def _search_terms(app: dict) -> List[str]:
+    """Lower-cased words of every searchable field, stored as an indexed array for prefix search."""
+    terms = set()
+    for field in SEARCH_WEIGHTS:
+        terms |= _tokens(app.get(field))
+    return sorted(terms)
+
+def _missing_bodies_message(log_ids: List[str]) -> str:
+    return f"Email body missing for logs: {', '.join(log_ids)}"
+
+# Columns of a CSV export, also the columns a CSV import understands
+CSV_FIELDS = [
+    "id", "company", "position", "dateApplied", "stage", "type", "tags", "lastUpdated",
+    "description", "salary", "location", "notes"
+]
+TAG_SEPARATOR = ";"
+EXPORT_BATCH_SIZE = 500
+EXPORT_FLUSH_BYTES = 64 * 1024
+# Rows parsed and inserted per insert_many
+IMPORT_CHUNK_SIZE = 500
+# Row errors listed in an import report; the rest are only counted
+MAX_IMPORT_ERRORS = 1000
+# Leading characters that make spreadsheet apps evaluate a cell as a formula, plus the escaping quote itself
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r", "'")
+
+def _csv_cell(value) -> str:
+    """Prefixes cells a spreadsheet would run as a formula with a quote; imports strip it again."""
+    if value is None:
+        return ""
+    text = str(value)
+    return "'" + text if text.startswith(FORMULA_PREFIXES) else text
+
+def _csv_value(cell: str) -> str:
+    return cell[1:] if cell.startswith("'") and cell[1:].startswith(FORMULA_PREFIXES) else cell
+
+def _csv_row(row: dict) -> dict:
+    """Drops empty cells so model defaults apply, undoes formula escaping and splits the tags cell."""
+    data = {key: _csv_value(value) for key, value in row.items() if key and value not in ("", None)}
+    if "tags" in data:
+        data["tags"] = [tag.strip() for tag in data["tags"].split(TAG_SEPARATOR) if tag.strip()]
+    return data
+
+async def _batches(cursor, size: int) -> AsyncIterator[List[dict]]:
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+# Fields a patch may change but not clear
+REQUIRED_FIELDS = {"company", "position", "dateApplied", "stage", "type", "tags", "lastUpdated"}
 
 class ApplicationService:
     def __init__(self):
         self.collection_name = "applications"
+        self._search_backfilled: Set[str] = set()
+        self.data_versions = DataVersionService()
+        self.sync = SyncService()
+        self.email_bodies = EmailBodyService()
 
     async def get_collection(self):
         db = await get_database()
@@ -14,11 +112,182 @@ class ApplicationService:
 
     async def get_all(self, user_email: str) -> List[Application]:
         collection = await self.get_collection()
-        applications = []
-        async for app in collection.find({"user_email": user_email}):
+        docs = await collection.find({"user_email": user_email}).to_list(None)
+        return ApplicationList.validate_python(with_ids(docs))
+
+    def _encode_cursor(self, app: dict) -> str:
+        raw = f"{app['lastUpdated'].isoformat()}|{app['_id']}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> Tuple[datetime, ObjectId]:
+        try:
+            last_updated, app_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(last_updated), ObjectId(app_id)
+        except (ValueError, InvalidId, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+
+    async def get_page(
+        self,
+        user_email: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        stage: Optional[str] = None,
+        type: Optional[str] = None,
+        tag: Optional[str] = None,
+        view: str = "board"
+    ) -> ApplicationPage:
+        """
+        Keyset pagination, newest lastUpdated first with _id as tie-breaker.
+        Filters run in Mongo; the board view leaves out logs and long text fields.
+        """
+        collection = await self.get_collection()
+        query = {"user_email": user_email}
+        if stage:
+            query["stage"] = stage
+        if type:
+            query["type"] = type
+        if tag:
+            query["tags"] = tag
+        if cursor:
+            last_updated, last_id = self._decode_cursor(cursor)
+            query["$or"] = [
+                {"lastUpdated": {"$lt": last_updated}},
+                {"lastUpdated": last_updated, "_id": {"$lt": last_id}}
+            ]
+
+        projection = BOARD_PROJECTION if view == "board" else None
+        adapter = ApplicationSummaryList if view == "board" else ApplicationList
+        # One extra document tells whether another page exists
+        results = collection.find(query, projection).sort([("lastUpdated", -1), ("_id", -1)]).limit(limit + 1)
+        docs = await results.to_list(limit + 1)
+
+        next_cursor = self._encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+        items = adapter.validate_python(with_ids(docs[:limit]))
+        return ApplicationPage(items=items, nextCursor=next_cursor)
+
+    async def get_logs(self, application_id: str, user_email: str) -> Optional[List[ApplicationLog]]:
+        collection = await self.get_collection()
+        app = await collection.find_one(
+            {"_id": ObjectId(application_id), "user_email": user_email},
+            {"logs": 1}
+        )
+        if app is None:
+            return None
+        logs = app.get("logs", [])
+        await self._resolve_email_bodies(user_email, logs)
+        return [ApplicationLog.model_validate(log) for log in logs]
+
+    async def _resolve_email_bodies(self, user_email: str, logs: List[dict]) -> None:
+        """Puts the stored body of each referenced email back inline into the log dicts."""
+        bodies = await self.email_bodies.get_many(
+            user_email, [log["emailBodyRef"] for log in logs if log.get("emailBodyRef") and not log.get("emailBody")]
+        )
+        for log in logs:
+            if log.get("emailBodyRef") in bodies:
+                log["emailBody"] = bodies[log["emailBodyRef"]]
+
+    def _take_email_bodies(self, logs: List[dict]) -> List[str]:
+        """Replaces the inline email bodies of log dicts with their refs and returns the bodies to store."""
+        bodies = []
+        for log in logs:
+            if log.get("emailBody"):
+                bodies.append(log["emailBody"])
+                log["emailBodyRef"] = body_ref(log["emailBody"])
+                log["emailBody"] = None
+        return bodies
+
+    async def _store_email_bodies(self, user_email: str, logs: List[dict]) -> None:
+        """Moves inline email bodies of log dicts to the body store, leaving only the ref."""
+        await self.email_bodies.store_many(user_email, self._take_email_bodies(logs))
+
+    async def _missing_body_refs(
+        self, user_email: str, logs_by_key: Dict[Hashable, List[ApplicationLog]]
+    ) -> Dict[Hashable, List[str]]:
+        """
+        Ids of the logs, per key, whose bare emailBodyRef names no body this user
+        has stored, in one query. Inline bodies are stored on write, so they pass.
+        """
+        bare = {key: [log for log in logs if log.emailBodyRef and not log.emailBody] for key, logs in logs_by_key.items()}
+        stored = await self.email_bodies.existing_refs(
+            user_email, [log.emailBodyRef for logs in bare.values() for log in logs]
+        )
+        missing = {key: [log.id for log in logs if log.emailBodyRef not in stored] for key, logs in bare.items()}
+        return {key: ids for key, ids in missing.items() if ids}
+
+    async def _check_body_refs(self, user_email: str, logs: List[ApplicationLog]) -> None:
+        missing = await self._missing_body_refs(user_email, {None: logs})
+        if missing:
+            raise HTTPException(status_code=400, detail=_missing_bodies_message(missing[None]))
+
+    async def _refresh_search_terms(self, object_ids: Iterable[ObjectId]) -> None:
+        collection = await self.get_collection()
+        updates = [
+            UpdateOne({"_id": app["_id"]}, {"$set": {"search_terms": _search_terms(app)}})
+            async for app in collection.find({"_id": {"$in": list(object_ids)}}, {field: 1 for field in SEARCH_WEIGHTS})
+        ]
+        if updates:
+            await collection.bulk_write(updates, ordered=False)
+
+    async def _backfill_search_terms(self, user_email: str) -> None:
+        """Indexes applications stored before search existed, once per user per process."""
+        if user_email in self._search_backfilled:
+            return
+        collection = await self.get_collection()
+        missing = collection.find({"user_email": user_email, "search_terms": {"$exists": False}}, {"_id": 1})
+        await self._refresh_search_terms([app["_id"] async for app in missing])
+        self._search_backfilled.add(user_email)
+
+    async def search(
+        self,
+        user_email: str,
+        q: str,
+        stage: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 20
+    ) -> List[ApplicationSearchResult]:
+        """
+        Prefix search over company, position, tags, location and notes. Every query
+        word must prefix some indexed word; results are ranked by field weight.
+        """
+        words = sorted(_tokens(q))
+        if not words:
+            return []
+        await self._backfill_search_terms(user_email)
+
+        collection = await self.get_collection()
+        # Anchored, case-sensitive regexes on lower-cased terms use the (user_email, search_terms) index
+        query = {
+            "user_email": user_email,
+            "search_terms": {"$all": [re.compile("^" + re.escape(word)) for word in words]}
+        }
+        if stage:
+            query["stage"] = stage
+        if start_date or end_date:
+            query["dateApplied"] = {}
+            if start_date:
+                query["dateApplied"]["$gte"] = start_date
+            if end_date:
+                query["dateApplied"]["$lt"] = end_date
+
+        matches = collection.find(query, {"logs": 0, "description": 0, "search_terms": 0}).limit(MAX_SEARCH_CANDIDATES)
+        candidates = await matches.to_list(MAX_SEARCH_CANDIDATES)
+
+        results = []
+        for app in candidates:
+            score = 0.0
+            for field, weight in SEARCH_WEIGHTS.items():
+                field_tokens = _tokens(app.get(field))
+                for word in words:
+                    if word in field_tokens:
+                        score += weight
+                    elif any(token.startswith(word) for token in field_tokens):
+                        score += weight / 2  # Prefix-only matches rank below whole words
             app["id"] = str(app.pop("_id"))
-            applications.append(Application.model_validate(app))
-        return applications
+            results.append(ApplicationSearchResult(score=score, application=ApplicationSummary.model_validate(app)))
+
+        results.sort(key=lambda r: (r.score, r.application.lastUpdated), reverse=True)
+        return results[:limit]
 
     async def get_by_id(self, application_id: str, user_email: str) -> Optional[Application]:
         collection = await self.get_collection()
@@ -31,43 +300,353 @@ class ApplicationService:
             return Application.model_validate(app)
         return None
 
-    async def create(self, application: Application, user: dict) -> Application:
-        collection = await self.get_collection()
+    def _new_document(self, application: Application, user: dict, seq: int) -> dict:
         application_dict = application.model_dump()
         application_dict["_id"] = ObjectId()
         application_dict["user_id"] = user["id"]
         application_dict["user_email"] = user["email"]
+        application_dict["search_terms"] = _search_terms(application_dict)
+        application_dict["seq"] = seq
         del application_dict["id"]
-        result = await collection.insert_one(application_dict)
+        return application_dict
+
+    async def create(self, application: Application, user: dict) -> Application:
+        collection = await self.get_collection()
+        await self._check_body_refs(user["email"], application.logs)
+        async with self.data_versions.seq_lease(user["email"]) as seq:
+            application_dict = self._new_document(application, user, seq)
+            await self._store_email_bodies(user["email"], application_dict["logs"])
+            result = await collection.insert_one(application_dict)
         application.id = str(result.inserted_id)
         return application
 
+    async def export(self, user_email: str, format: str) -> AsyncIterator[str]:
+        """
+        Streams every application as CSV or NDJSON from the cursor, holding one batch at a time.
+        NDJSON logs carry their email bodies inline, so a backup restores on its own.
+        """
+        collection = await self.get_collection()
+        cursor = collection.find({"user_email": user_email}).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(CSV_FIELDS)
+
+        async for batch in _batches(cursor, EXPORT_BATCH_SIZE):
+            if format != "csv":
+                await self._resolve_email_bodies(user_email, [log for app in batch for log in app.get("logs", [])])
+            for app in batch:
+                app["id"] = str(app["_id"])
+                application = Application.model_validate(app)
+                if format == "csv":
+                    row = application.model_dump(mode="json", include=set(CSV_FIELDS))
+                    row["tags"] = TAG_SEPARATOR.join(row["tags"])
+                    writer.writerow([_csv_cell(row[field]) for field in CSV_FIELDS])
+                else:
+                    buffer.write(application.model_dump_json())
+                    buffer.write("\n")
+                if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue()
+
+    def _parse_rows(self, file: BinaryIO, format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+        """Yields (line number, row, error) while reading the upload incrementally."""
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        if format == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, _csv_row(row), None
+            return
+
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(data, dict):
+                yield number, data, None
+            else:
+                yield number, None, "Expected a JSON object"
+
+    def _add_import_error(self, result: ApplicationImportResult, row: int, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_IMPORT_ERRORS:
+            result.errors.append(ImportRowError(row=row, error=error))
+
+    async def _existing_ids(self, user_email: str, ids: List[str]) -> Set[str]:
+        """The ids that name one of the user's applications, by _id or by imported_id."""
+        if not ids:
+            return set()
+        collection = await self.get_collection()
+        object_ids = [ObjectId(id) for id in ids if ObjectId.is_valid(id)]
+        existing = set()
+        async for app in collection.find(
+            {"user_email": user_email, "$or": [{"_id": {"$in": object_ids}}, {"imported_id": {"$in": ids}}]},
+            {"_id": 1, "imported_id": 1}
+        ):
+            existing.add(str(app["_id"]))
+            existing.add(app.get("imported_id"))
+        return existing
+
+    async def import_file(self, file: BinaryIO, format: str, user: dict) -> ApplicationImportResult:
+        """
+        Validates uploaded rows against Application and inserts them in chunks
+        with unordered insert_many, so a bad row fails on its own. Every row
+        gets a new id; the id of an exported application is kept as imported_id,
+        and rows naming an application the user still has are skipped, so
+        re-importing a backup does not duplicate it.
+        """
+        collection = await self.get_collection()
+        rows = self._parse_rows(file, format)
+        result = ApplicationImportResult()
+        last_row = 0
+
+        while True:
+            try:
+                # Reading the spooled upload may hit the disk, so parse off the event loop
+                chunk = await run_in_threadpool(lambda: list(islice(rows, IMPORT_CHUNK_SIZE)))
+            except (UnicodeDecodeError, csv.Error) as e:
+                self._add_import_error(result, last_row + 1, f"Unreadable file: {e}")
+                break
+            if not chunk:
+                break
+            last_row = chunk[-1][0]
+
+            now = datetime.utcnow()
+            applications = []
+            for number, data, error in chunk:
+                if error is None:
+                    try:
+                        application = Application.model_validate({
+                            "tags": [], "lastUpdated": now, **data, "user_id": user["id"], "user_email": user["email"]
+                        })
+                    except ValidationError as e:
+                        error = _validation_message(e)
+                if error:
+                    self._add_import_error(result, number, error)
+                    continue
+                applications.append((number, application, str(data["id"]) if data.get("id") else None))
+
+            existing = await self._existing_ids(user["email"], [imported_id for _, _, imported_id in applications if imported_id])
+            missing = await self._missing_body_refs(user["email"], {number: app.logs for number, app, _ in applications})
+            new_rows = []
+            for number, application, imported_id in applications:
+                if imported_id and imported_id in existing:
+                    self._add_import_error(result, number, "Application already exists")
+                elif number in missing:
+                    self._add_import_error(result, number, _missing_bodies_message(missing[number]))
+                else:
+                    new_rows.append((number, application, imported_id))
+
+            if not new_rows:
+                continue
+            async with self.data_versions.seq_lease(user["email"]) as seq:
+                documents = []
+                for number, application, imported_id in new_rows:
+                    application_dict = self._new_document(application, user, seq)
+                    if imported_id:
+                        application_dict["imported_id"] = imported_id
+                    documents.append(application_dict)
+                await self._store_email_bodies(user["email"], [log for doc in documents for log in doc["logs"]])
+                try:
+                    inserted = len((await collection.insert_many(documents, ordered=False)).inserted_ids)
+                except BulkWriteError as e:
+                    inserted = e.details.get("nInserted", 0)
+                    for write_error in e.details.get("writeErrors", []):
+                        self._add_import_error(result, new_rows[write_error["index"]][0], write_error.get("errmsg"))
+            result.inserted += inserted
+        return result
+
+    def _bulk_request(
+        self, operation: BulkOperation, object_id: ObjectId, user: dict, now: datetime, seq: int, logs: List[dict]
+    ):
+        target = {"_id": object_id, "user_email": user["email"]}
+        if isinstance(operation, BulkDelete):
+            return DeleteOne(target)
+
+        update = {"$set": {"lastUpdated": now, "seq": seq}, "$inc": {"version": 1}}
+        if isinstance(operation, BulkMoveStage):
+            update["$set"]["stage"] = operation.stage
+            if operation.log:
+                log = operation.log.model_dump()
+                logs.append(log)
+                update["$push"] = {"logs": log}
+        elif operation.op == "add_tag":
+            update["$addToSet"] = {"tags": operation.tag}
+        else:
+            update["$pull"] = {"tags": operation.tag}
+        return UpdateOne(target, update)
+
+    async def bulk(self, operations: List[BulkOperation], user: dict) -> List[BulkItemResult]:
+        """
+        Runs a list of typed operations as one unordered bulk_write and reports
+        a result per operation. Targets are checked up front with a single query
+        so missing applications are reported instead of silently matching nothing.
+        """
+        collection = await self.get_collection()
+        results = [BulkItemResult(index=i, op=operation.op, status="ok") for i, operation in enumerate(operations)]
+
+        object_ids = {}
+        for i, operation in enumerate(operations):
+            if isinstance(operation, BulkCreate):
+                continue
+            try:
+                object_ids[i] = ObjectId(operation.id)
+                results[i].id = operation.id
+            except InvalidId:
+                results[i].status = "not_found"
+        logs_by_index = {}
+        for i, operation in enumerate(operations):
+            if isinstance(operation, BulkCreate):
+                logs_by_index[i] = operation.application.logs
+            elif isinstance(operation, BulkMoveStage) and operation.log:
+                logs_by_index[i] = [operation.log]
+        for i, log_ids in (await self._missing_body_refs(user["email"], logs_by_index)).items():
+            results[i].status = "error"
+            results[i].error = _missing_bodies_message(log_ids)
+        existing = set()
+        if object_ids:
+            async for app in collection.find(
+                {"_id": {"$in": list(object_ids.values())}, "user_email": user["email"]},
+                {"_id": 1}
+            ):
+                existing.add(app["_id"])
+
+        now = datetime.utcnow()
+        async with self.data_versions.seq_lease(user["email"]) as seq:
+            requests = []
+            request_index = []  # Position in operations of each request sent
+            logs = []  # Log dicts referenced by the requests, to move their bodies out before writing
+            for i, operation in enumerate(operations):
+                if results[i].status != "ok":
+                    continue
+                if isinstance(operation, BulkCreate):
+                    application_dict = self._new_document(operation.application, user, seq)
+                    results[i].id = str(application_dict["_id"])
+                    logs.extend(application_dict["logs"])
+                    requests.append(InsertOne(application_dict))
+                elif object_ids[i] in existing:
+                    requests.append(self._bulk_request(operation, object_ids[i], user, now, seq, logs))
+                else:
+                    results[i].status = "not_found"
+                    continue
+                request_index.append(i)
+
+            if requests:
+                await self._store_email_bodies(user["email"], logs)
+                try:
+                    await collection.bulk_write(requests, ordered=False)
+                except BulkWriteError as e:
+                    for write_error in e.details.get("writeErrors", []):
+                        result = results[request_index[write_error["index"]]]
+                        result.status = "error"
+                        result.error = write_error.get("errmsg")
+                await self.sync.record_deleted(
+                    user["email"],
+                    self.collection_name,
+                    [results[i].id for i in request_index if operations[i].op == "delete" and results[i].status == "ok"],
+                    seq
+                )
+
+        retagged = [object_ids[i] for i in request_index if operations[i].op in ("add_tag", "remove_tag")]
+        if retagged:
+            await self._refresh_search_terms(retagged)
+        return results
+
     async def update(self, application_id: str, application: Application, user_email: str) -> Optional[Application]:
+        """
+        Replaces every field and increments the stored version. A version sent by
+        the client must match the stored one; without it the version read here is
+        the baseline. Raises 409 when another write got in between.
+        """
         collection = await self.get_collection()
-        application_dict = application.model_dump()
-        application_dict["_id"] = ObjectId(application_id)
-        del application_dict["id"]
+        query = {"_id": ObjectId(application_id), "user_email": user_email}
+        stored = await collection.find_one(query, projection={"version": 1})
+        if not stored:
+            return None
+        expected_version = application.version if "version" in application.model_fields_set else stored.get("version")
+        await self._check_body_refs(user_email, application.logs)
+
+        application_dict = application.model_dump(exclude={"id", "version"})
         application_dict["user_email"] = user_email
-        result = await collection.replace_one(
-            {
-                "_id": ObjectId(application_id),
-                "user_email": user_email
-            },
-            application_dict
-        )
-        if result.modified_count:
-            return application
+        application_dict["search_terms"] = _search_terms(application_dict)
+        async with self.data_versions.seq_lease(user_email) as seq:
+            application_dict["seq"] = seq
+            await self._store_email_bodies(user_email, application_dict["logs"])
+            app = await collection.find_one_and_update(
+                {**query, "version": expected_version},
+                {"$set": application_dict, "$inc": {"version": 1}},
+                projection={"search_terms": 0, "seq": 0},
+                return_document=ReturnDocument.AFTER
+            )
+        if not app:
+            raise HTTPException(status_code=409, detail="Application was modified by another request")
+        return Application.model_validate(with_ids([app])[0])
+
+    async def patch(self, application_id: str, patch: ApplicationPatch, user_email: str) -> Optional[ApplicationSummary]:
+        """
+        Applies only the changed fields with $set and appends logs with $push,
+        so a write costs about the size of the change. Raises 409 when the
+        application was modified since the client read patch.version.
+        """
+        collection = await self.get_collection()
+        changes = patch.model_dump(exclude_unset=True, exclude={"version", "appendLogs"})
+        cleared = [field for field in REQUIRED_FIELDS if field in changes and changes[field] is None]
+        if cleared:
+            raise HTTPException(status_code=400, detail=f"Fields cannot be cleared: {', '.join(sorted(cleared))}")
+        changes.setdefault("lastUpdated", datetime.utcnow())
+
+        update = {"$set": dict(changes), "$inc": {"version": 1}}
+        bodies = []
+        if patch.appendLogs:
+            await self._check_body_refs(user_email, patch.appendLogs)
+            logs = [log.model_dump() for log in patch.appendLogs]
+            bodies = self._take_email_bodies(logs)
+            update["$push"] = {"logs": {"$each": logs}}
+
+        async with self.data_versions.seq_lease(user_email) as seq:
+            update["$set"]["seq"] = seq
+            app = await collection.find_one_and_update(
+                {"_id": ObjectId(application_id), "user_email": user_email, "version": patch.version},
+                update,
+                projection=BOARD_PROJECTION,
+                return_document=ReturnDocument.AFTER
+            )
+            if app:
+                # Only once the version check passed, so a 409 leaves no orphaned bodies behind
+                await self.email_bodies.store_many(user_email, bodies)
+        if app:
+            if SEARCH_WEIGHTS.keys() & changes.keys():
+                await self._refresh_search_terms([app["_id"]])
+            app["id"] = str(app.pop("_id"))
+            return ApplicationSummary.model_validate(app)
+
+        if await collection.count_documents({"_id": ObjectId(application_id), "user_email": user_email}, limit=1):
+            raise HTTPException(status_code=409, detail="Application was modified by another request")
         return None
 
     async def delete(self, application_id: str, user_email: str) -> bool:
         collection = await self.get_collection()
-        result = await collection.delete_one({
-            "_id": ObjectId(application_id),
-            "user_email": user_email
-        })
+        async with self.data_versions.seq_lease(user_email) as seq:
+            result = await collection.delete_one({
+                "_id": ObjectId(application_id),
+                "user_email": user_email
+            })
+            if result.deleted_count:
+                await self.sync.record_deleted(user_email, self.collection_name, [application_id], seq)
         return result.deleted_count > 0
 
     async def delete_all(self, user_email: str) -> bool:
         collection = await self.get_collection()
-        result = await collection.delete_many({"user_email": user_email})
+        async with self.data_versions.seq_lease(user_email) as seq:
+            result = await collection.delete_many({"user_email": user_email})
+            if result.deleted_count:
+                await self.sync.record_reset(user_email, self.collection_name, seq)
+        if result.deleted_count:
+            await self.email_bodies.delete_all(user_email)
         return result.deleted_count > 0
\ No newline at end of file
@@ -1,6 +1,5 @@
 # app/services/auth_service.py
 from datetime import datetime, timedelta
-import bcrypt
 import jwt
 import os
 import uuid
@@ -9,6 +8,8 @@ from app.database import get_database
 from app.models.user import User
 from app.models.auth import RegisterRequest, LoginRequest
 from app.services.mail_sender_service import MailSenderService
+from app.middleware.auth import invalidate_user
+from app.services.password_hasher import hash_password, needs_rehash, verify_password
 
 JWT_SECRET = os.getenv("JWT_SECRET", "change_this_to_a_secure_random_value")
 JWT_ALGORITHM = "HS256"
@@ -23,7 +24,7 @@ class AuthService:
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already in use.")
 
-        hashed_pw = bcrypt.hashpw(data.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed_pw = await hash_password(data.password, data.email)
         now = datetime.utcnow()
 
         # Initialize token_version to 0 for new users
@@ -48,7 +49,7 @@ class AuthService:
         if not user or not user.get("hashed_password"):
             raise HTTPException(status_code=401, detail="Invalid email or password.")
 
-        if not bcrypt.checkpw(data.password.encode('utf-8'), user["hashed_password"].encode('utf-8')):
+        if not await verify_password(data.password, user["hashed_password"], data.email):
             raise HTTPException(status_code=401, detail="Invalid email or password.")
 
         exp = datetime.utcnow() + timedelta(minutes=JWT_EXPIRATION_MINUTES)
@@ -59,7 +60,11 @@ class AuthService:
             "token_version": user.get("token_version", 0)
         }
         token = jwt.encode(token_payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-        await db["users"].update_one({"id": user["id"]}, {"$set": {"last_login": datetime.utcnow()}})
+        updates = {"last_login": datetime.utcnow()}
+        # The plain password is only available now, so this is when a hash can move to new rounds
+        if needs_rehash(user["hashed_password"]):
+            updates["hashed_password"] = await hash_password(data.password, data.email)
+        await db["users"].update_one({"id": user["id"]}, {"$set": updates})
         return {"access_token": token, "token_type": "bearer"}
 
     @staticmethod
@@ -86,7 +91,7 @@ class AuthService:
             "used": False
         })
 
-        MailSenderService.send_password_reset_email(email, reset_token)
+        await MailSenderService.send_password_reset_email(email, reset_token)
         return {"message": "If that email is registered, a password reset link has been sent."}
 
     @staticmethod
@@ -102,7 +107,7 @@ class AuthService:
         if record["expires_at"] < datetime.utcnow():
             raise HTTPException(status_code=400, detail="Token expired")
 
-        hashed_pw = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed_pw = await hash_password(new_password, record["user_id"])
 
         # Increase token_version to invalidate old tokens
         # Fetch the user to get current token_version, increment it
@@ -119,6 +124,7 @@ class AuthService:
                 "token_version": new_version
             }
         })
+        invalidate_user(record["user_id"])
 
         await db["password_reset_tokens"].update_one({"token": token}, {"$set": {"used": True}})
         return {"message": "Password has been reset successfully. All old sessions are now invalid."}
\ No newline at end of file
@@ -0,0 +1,113 @@
+# app/services/data_version_service.py
+import asyncio
+import hashlib
+from bson import ObjectId
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Tuple
+from pymongo import ReturnDocument
+from ..cache import TTLCache
+from ..database import get_database
+
+# A write still holding its seq after this long is assumed to have died with its process
+SEQ_LEASE_SECONDS = 300
+SEEN_SEQ_CACHE_SIZE = 10000
+
+# Highest seq this process has reserved per user. Seqs only grow, so it is always a valid lease floor.
+_seen_seqs = TTLCache(maxsize=SEEN_SEQ_CACHE_SIZE)
+
+class DataVersionService:
+    """
+    Per-user counters. version is bumped after every write to the user's
+    applications or workflows and validates conditional GETs; seq is leased
+    for the duration of a write and stamped on the changed documents for
+    delta sync. A leased write costs two updates: the reserve, and the
+    release that also bumps version.
+    """
+    def __init__(self):
+        self.collection_name = "data_versions"
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    async def get(self, user_email: str, field: str = "version") -> int:
+        collection = await self.get_collection()
+        doc = await collection.find_one({"_id": user_email}, {field: 1})
+        return doc.get(field, 0) if doc else 0
+
+    async def bump(self, user_email: str) -> int:
+        collection = await self.get_collection()
+        doc = await collection.find_one_and_update(
+            {"_id": user_email},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+
+    async def _reserve_seq(self, user_email: str) -> Tuple[int, ObjectId]:
+        """Takes the next seq and registers it as in flight, in one update. Returns (seq, lease id)"""
+        collection = await self.get_collection()
+        # Any value below the new seq is a valid floor; only a user this process has not written for needs a read
+        floor = _seen_seqs.get(user_email)
+        if floor is None:
+            floor = await self.get(user_email, "seq")
+        lease_id = ObjectId()
+        doc = await collection.find_one_and_update(
+            {"_id": user_email},
+            {
+                "$inc": {"seq": 1},
+                "$push": {"leases": {"id": lease_id, "floor": floor, "at": datetime.utcnow()}}
+            },
+            projection={"seq": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc["seq"] <= floor:
+            # The counter restarted under a cached floor (its document was removed); pin the exact one
+            await collection.update_one(
+                {"_id": user_email, "leases.id": lease_id}, {"$set": {"leases.$.floor": doc["seq"] - 1}}
+            )
+        _seen_seqs.set(user_email, doc["seq"])
+        return doc["seq"], lease_id
+
+    async def _release_seq(self, user_email: str, lease_id: ObjectId, bump: bool) -> None:
+        collection = await self.get_collection()
+        update = {"$pull": {"leases": {"id": lease_id}}}
+        if bump:
+            # Only once the write is done, so a GET that reads the version first never tags old data as new
+            update["$inc"] = {"version": 1}
+        await collection.update_one({"_id": user_email}, update)
+
+    @asynccontextmanager
+    async def seq_lease(self, user_email: str, bump: bool = True) -> AsyncIterator[int]:
+        """
+        Yields the seq to stamp on one write. Sync tokens stay below it until
+        the block exits, so a write that commits after a sync read is still sent.
+        On exit version is bumped too, unless bump is False.
+        """
+        seq, lease_id = await self._reserve_seq(user_email)
+        try:
+            yield seq
+        finally:
+            # Shielded so a cancelled or failed write still releases; a held lease pins every sync token
+            await asyncio.shield(self._release_seq(user_email, lease_id, bump))
+
+    async def committed_seq(self, user_email: str) -> int:
+        """Highest seq up to which every write has finished, i.e. a safe sync token."""
+        collection = await self.get_collection()
+        doc = await collection.find_one({"_id": user_email}, {"seq": 1, "leases": 1})
+        if not doc:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(seconds=SEQ_LEASE_SECONDS)
+        leases = doc.get("leases", [])
+        live = [lease for lease in leases if lease["at"] >= cutoff]
+        if len(live) < len(leases):
+            await collection.update_one({"_id": user_email}, {"$pull": {"leases": {"at": {"$lt": cutoff}}}})
+        return min([doc.get("seq", 0), *(lease["floor"] for lease in live)])
+
+    async def etag(self, user_email: str) -> str:
+        """Versions are per-user counters, so the tag also hashes in the user; two accounts never share one."""
+        digest = hashlib.sha256(f"{user_email}:{await self.get(user_email)}".encode()).hexdigest()
+        return f'"{digest[:32]}"'
@@ -0,0 +1,71 @@
+# app/services/email_body_service.py
+import hashlib
+import zlib
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Dict, Iterable, List, Set
+from ..database import get_database
+
+DUPLICATE_KEY = 11000
+
+def body_ref(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+class EmailBodyService:
+    """
+    Content-addressed store for the email bodies quoted in application logs.
+    Each distinct body is kept once per user, zlib-compressed and keyed by
+    its SHA-256, so logs only carry the hash.
+    """
+    def __init__(self):
+        self.collection_name = "email_bodies"
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    async def store_many(self, user_email: str, bodies: Iterable[str]) -> List[str]:
+        """Stores the bodies not already present and returns the ref of each, in order."""
+        refs = []
+        operations = {}
+        now = datetime.utcnow()
+        for body in bodies:
+            ref = body_ref(body)
+            refs.append(ref)
+            if ref not in operations:
+                operations[ref] = UpdateOne(
+                    {"user_email": user_email, "hash": ref},
+                    {"$setOnInsert": {"body": zlib.compress(body.encode()), "size": len(body), "created_at": now}},
+                    upsert=True
+                )
+        if operations:
+            collection = await self.get_collection()
+            try:
+                await collection.bulk_write(list(operations.values()), ordered=False)
+            except BulkWriteError as e:
+                # A concurrent upsert of the same body won the race; it is stored either way
+                if any(error["code"] != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+                    raise
+        return refs
+
+    async def get_many(self, user_email: str, refs: Iterable[str]) -> Dict[str, str]:
+        refs = list(set(refs))
+        if not refs:
+            return {}
+        collection = await self.get_collection()
+        bodies = {}
+        async for doc in collection.find({"user_email": user_email, "hash": {"$in": refs}}, {"hash": 1, "body": 1}):
+            bodies[doc["hash"]] = zlib.decompress(doc["body"]).decode()
+        return bodies
+
+    async def existing_refs(self, user_email: str, refs: Iterable[str]) -> Set[str]:
+        refs = list(set(refs))
+        if not refs:
+            return set()
+        collection = await self.get_collection()
+        return {doc["hash"] async for doc in collection.find({"user_email": user_email, "hash": {"$in": refs}}, {"hash": 1})}
+
+    async def delete_all(self, user_email: str) -> None:
+        collection = await self.get_collection()
+        await collection.delete_many({"user_email": user_email})
@@ -1,12 +1,18 @@
 # app/services/email_service.py
 from bson import ObjectId
+from pymongo import UpdateOne
 from typing import List, Optional, Dict
-from ..models.email import Email
+from ..models.email import Email, EmailList
 from ..database import get_database
+from ..serialization import with_ids
+from .data_version_service import DataVersionService
+from .sync_service import SyncService
 
 class EmailService:
     def __init__(self):
         self.collection_name = "emails"
+        self.data_versions = DataVersionService()
+        self.sync = SyncService()
 
     async def get_collection(self):
         db = await get_database()
@@ -14,11 +20,8 @@ class EmailService:
 
     async def get_all(self, user: Dict) -> List[Email]:
         collection = await self.get_collection()
-        emails = []
-        async for email in collection.find({"user_email": user["email"]}):
-            email["id"] = str(email.pop("_id"))
-            emails.append(Email.model_validate(email))
-        return emails
+        docs = await collection.find({"user_email": user["email"]}).to_list(None)
+        return EmailList.validate_python(with_ids(docs))
 
     async def create(self, email: Email, user: Dict) -> Email:
         collection = await self.get_collection()
@@ -27,21 +30,48 @@ class EmailService:
         email_dict["user_id"] = user["id"]
         email_dict["user_email"] = user["email"]
         email_dict["id"]
-        await collection.insert_one(email_dict)
+        async with self.data_versions.seq_lease(user["email"], bump=False) as seq:
+            email_dict["seq"] = seq
+            await collection.insert_one(email_dict)
         return email
 
+    async def upsert_many(self, emails: List[Email], user: Dict) -> int:
+        """Stores imported emails once per Gmail id, keeping the processed flag of ones already stored."""
+        if not emails:
+            return 0
+        collection = await self.get_collection()
+        async with self.data_versions.seq_lease(user["email"], bump=False) as seq:
+            operations = []
+            for email in emails:
+                email_dict = email.model_dump()
+                email_dict["_id"] = ObjectId()
+                email_dict["user_id"] = user["id"]
+                email_dict["user_email"] = user["email"]
+                email_dict["seq"] = seq
+                operations.append(UpdateOne(
+                    {"user_email": user["email"], "id": email.id},
+                    {"$setOnInsert": email_dict},
+                    upsert=True
+                ))
+            result = await collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+
     async def mark_as_processed(self, email_ids: List[str], user: Dict) -> bool:
         collection = await self.get_collection()
-        result = await collection.update_many(
-            {
-                "_id": {"$in": [ObjectId(id) for id in email_ids]},
-                "user_email": user["email"]  # Only update user's own emails
-            },
-            {"$set": {"processed": True}}
-        )
+        async with self.data_versions.seq_lease(user["email"], bump=False) as seq:
+            result = await collection.update_many(
+                {
+                    "_id": {"$in": [ObjectId(id) for id in email_ids]},
+                    "user_email": user["email"]  # Only update user's own emails
+                },
+                {"$set": {"processed": True, "seq": seq}}
+            )
         return result.modified_count > 0
     
     async def delete_all(self, user_email: str) -> bool:
         collection = await self.get_collection()
-        result = await collection.delete_many({"user_email": user_email})
+        async with self.data_versions.seq_lease(user_email, bump=False) as seq:
+            result = await collection.delete_many({"user_email": user_email})
+            if result.deleted_count:
+                await self.sync.record_reset(user_email, self.collection_name, seq)
         return result.deleted_count > 0
\ No newline at end of file
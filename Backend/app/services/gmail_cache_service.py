@@ -0,0 +1,58 @@
+# app/services/gmail_cache_service.py
+from datetime import datetime
+from typing import Dict, List
+from pymongo import UpdateOne
+from ..models.email import Email
+from ..database import get_database
+from ..config import settings
+
+class GmailMessageCache:
+    """
+    Parsed Gmail messages keyed by (user_id, message_id), so paging back and forth
+    in the import modal does not download and parse the same message twice.
+    Entries expire through a TTL index on cached_at (see init_db) and each user
+    is capped at GMAIL_CACHE_MAX_ENTRIES, evicting the oldest first.
+    """
+    def __init__(self):
+        self.collection_name = "gmail_message_cache"
+        self.max_entries_per_user = settings.GMAIL_CACHE_MAX_ENTRIES
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    async def get_many(self, user_id: str, message_ids: List[str]) -> Dict[str, Email]:
+        if not message_ids:
+            return {}
+        collection = await self.get_collection()
+        cached = {}
+        async for doc in collection.find({"user_id": user_id, "message_id": {"$in": message_ids}}):
+            cached[doc["message_id"]] = Email.model_validate(doc["email"])
+        return cached
+
+    async def put_many(self, user_id: str, emails: List[Email]) -> None:
+        if not emails:
+            return
+        collection = await self.get_collection()
+        now = datetime.utcnow()
+        await collection.bulk_write([
+            UpdateOne(
+                {"user_id": user_id, "message_id": email.id},
+                {"$set": {"email": email.model_dump(), "cached_at": now}},
+                upsert=True
+            )
+            for email in emails
+        ], ordered=False)
+        await self._evict(user_id)
+
+    async def _evict(self, user_id: str) -> None:
+        collection = await self.get_collection()
+        excess = await collection.count_documents({"user_id": user_id}) - self.max_entries_per_user
+        if excess <= 0:
+            return
+        oldest = collection.find({"user_id": user_id}, {"_id": 1}).sort("cached_at", 1).limit(excess)
+        await collection.delete_many({"_id": {"$in": [doc["_id"] async for doc in oldest]}})
+
+    async def clear(self, user_id: str) -> None:
+        collection = await self.get_collection()
+        await collection.delete_many({"user_id": user_id})
@@ -0,0 +1,56 @@
+# app/services/gmail_client_factory.py
+from typing import Dict, Tuple
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from ..cache import TTLCache
+from ..config import settings
+
+class GmailClientFactory:
+    """
+    Builds Google API clients from the discovery documents bundled with
+    googleapiclient, parsed once per process, and keeps an LRU of per-user
+    authorized Gmail clients so credentials and resources are reused.
+    """
+    def __init__(self, max_clients: int):
+        self._documents: Dict[Tuple[str, str], str] = {}
+        self._clients = TTLCache(maxsize=max_clients)
+
+    def _discovery_document(self, api: str, version: str) -> str:
+        key = (api, version)
+        if key not in self._documents:
+            document = get_static_doc(api, version)
+            if document is None:
+                raise RuntimeError(f"No bundled discovery document for {api} {version}")
+            self._documents[key] = document
+        return self._documents[key]
+
+    def build(self, api: str, version: str, credentials: Credentials):
+        return build_from_document(self._discovery_document(api, version), credentials=credentials)
+
+    def gmail_client(self, user_id: str, creds_doc: dict, client_config: dict) -> Tuple[object, Credentials]:
+        """
+        Returns (gmail service, credentials) for the user, reusing the cached pair
+        unless the stored grant changed (re-link) since it was built.
+        """
+        cached = self._clients.get(user_id)
+        if cached and cached[0] == creds_doc["refresh_token"]:
+            return cached[1], cached[2]
+
+        credentials = Credentials(
+            token=creds_doc["access_token"],
+            refresh_token=creds_doc["refresh_token"],
+            # Lets google-auth trust the stored token until it expires instead of refreshing blindly
+            expiry=creds_doc.get("token_expiry"),
+            token_uri=client_config["web"]["token_uri"],
+            client_id=client_config["web"]["client_id"],
+            client_secret=client_config["web"]["client_secret"]
+        )
+        service = self.build("gmail", "v1", credentials)
+        self._clients.set(user_id, (creds_doc["refresh_token"], service, credentials))
+        return service, credentials
+
+    def evict(self, user_id: str) -> None:
+        self._clients.pop(user_id)
+
+gmail_client_factory = GmailClientFactory(max_clients=settings.GMAIL_CLIENT_CACHE_SIZE)
@@ -0,0 +1,232 @@
+# app/services/gmail_import_service.py
+import asyncio
+import logging
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from pymongo import ReturnDocument
+from ..models.gmail import GmailFetchParams, GmailImportJobRequest
+from ..database import get_database
+from ..config import settings
+from .gmail_service import GmailService
+from .email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+# Only the most recent errors are kept on the job document
+MAX_JOB_ERRORS = 50
+UNFINISHED = ["queued", "running"]
+
+class GmailImportService:
+    """
+    Imports large Gmail selections in the background. Jobs are queued to an
+    in-process pool of asyncio workers that walk the listing page by page and
+    store the parsed emails in the emails collection. Progress lives on the job
+    document so any request can poll it.
+
+    The queue is lost with its process, so every instance keeps a heartbeat on
+    the jobs it holds and adopts unfinished jobs whose heartbeat went stale.
+    Adopted jobs start over; storing emails is idempotent.
+    """
+    def __init__(self, gmail_service: GmailService, email_service: Optional[EmailService] = None):
+        self.collection_name = "gmail_import_jobs"
+        self.gmail_service = gmail_service
+        self.email_service = email_service or EmailService()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._held: Set[ObjectId] = set()  # Jobs queued or running in this process
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    def _ensure_workers(self) -> None:
+        # Created lazily so they bind to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < settings.GMAIL_IMPORT_WORKERS:
+            self._workers.append(asyncio.create_task(self._worker()))
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._keep_alive())
+
+    async def _enqueue(self, job: dict) -> None:
+        self._ensure_workers()
+        self._held.add(job["_id"])
+        await self._queue.put(job)
+
+    async def start(self) -> None:
+        """Starts the workers and adopts jobs left unfinished by an instance that went away."""
+        self._ensure_workers()
+        await self.recover()
+
+    async def stop(self) -> None:
+        for task in [*self._workers, self._heartbeat]:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*self._workers, *filter(None, [self._heartbeat]), return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+        self._queue = None
+        self._held.clear()
+
+    async def recover(self) -> int:
+        """Requeues unfinished jobs with a stale heartbeat and returns how many were adopted."""
+        collection = await self.get_collection()
+        now = datetime.utcnow()
+        stale = {
+            "status": {"$in": UNFINISHED},
+            "$or": [
+                {"heartbeat_at": {"$lt": now - timedelta(seconds=settings.GMAIL_IMPORT_STALE_SECONDS)}},
+                {"heartbeat_at": {"$exists": False}}
+            ]
+        }
+        recovered = 0
+        while True:
+            # Claimed one at a time, so two instances starting together never adopt the same job
+            job = await collection.find_one_and_update(
+                stale,
+                {
+                    "$set": {
+                        "status": "queued",
+                        "heartbeat_at": now,
+                        "processed": 0,
+                        "stored": 0,
+                        "failed": 0,
+                        "pages": 0,
+                        "started_at": None
+                    },
+                    "$inc": {"restarts": 1}
+                },
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None:
+                break
+            logger.warning(f"Restarting Gmail import job {job['_id']} left unfinished by another instance")
+            await self._enqueue(job)
+            recovered += 1
+        return recovered
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(settings.GMAIL_IMPORT_HEARTBEAT_SECONDS)
+            try:
+                if self._held:
+                    collection = await self.get_collection()
+                    await collection.update_many(
+                        {"_id": {"$in": list(self._held)}}, {"$set": {"heartbeat_at": datetime.utcnow()}}
+                    )
+                await self.recover()
+            except Exception as e:
+                logger.error(f"Gmail import heartbeat failed: {e}")
+
+    async def submit(self, request: GmailImportJobRequest, user: Dict) -> dict:
+        collection = await self.get_collection()
+        job = {
+            "_id": ObjectId(),
+            "user_id": user["id"],
+            "user_email": user["email"],
+            "request": request.model_dump(),
+            "status": "queued",
+            "processed": 0,
+            "stored": 0,
+            "failed": 0,
+            "pages": 0,
+            "errors": [],
+            "created_at": datetime.utcnow(),
+            "heartbeat_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None
+        }
+        await collection.insert_one(job)
+        await self._enqueue(job)
+        return {"id": str(job["_id"]), "status": job["status"]}
+
+    async def get(self, job_id: str, user: Dict) -> Optional[dict]:
+        collection = await self.get_collection()
+        try:
+            job = await collection.find_one({"_id": ObjectId(job_id), "user_id": user["id"]})
+        except InvalidId:
+            return None
+        if not job:
+            return None
+
+        job["id"] = str(job.pop("_id"))
+        started_at = job.get("started_at")
+        if started_at:
+            elapsed = ((job.get("finished_at") or datetime.utcnow()) - started_at).total_seconds()
+            job["messages_per_second"] = round(job["processed"] / elapsed, 2) if elapsed > 0 else None
+        else:
+            job["messages_per_second"] = None
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.error(f"Gmail import job {job['_id']} failed: {e}")
+                await self._update(job["_id"], {
+                    "$set": {"status": "failed", "finished_at": datetime.utcnow()},
+                    "$push": {"errors": {"$each": [{"error": str(e)}], "$slice": -MAX_JOB_ERRORS}}
+                })
+            finally:
+                self._held.discard(job["_id"])
+                self._queue.task_done()
+
+    async def _update(self, job_id: ObjectId, update: dict) -> None:
+        collection = await self.get_collection()
+        await collection.update_one({"_id": job_id}, update)
+
+    async def _run(self, job: dict) -> None:
+        user = {"id": job["user_id"], "email": job["user_email"]}
+        request = GmailImportJobRequest.model_validate(job["request"])
+        await self._update(job["_id"], {"$set": {"status": "running", "started_at": datetime.utcnow()}})
+
+        def page_params(page_token: Optional[str], remaining: int) -> GmailFetchParams:
+            return GmailFetchParams(
+                tags=request.tags,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                search_query=request.search_query,
+                limit=min(request.page_size, remaining),
+                page_token=page_token,
+                batch_size=request.page_size
+            )
+
+        remaining = request.max_messages
+        listing = asyncio.ensure_future(self.gmail_service.list_message_page(user["id"], page_params(None, remaining)))
+        try:
+            while listing is not None:
+                message_ids, next_page_token = await listing
+                remaining -= len(message_ids)
+
+                # Prefetch the next listing page while this one is fetched and parsed
+                listing = None
+                if next_page_token and remaining > 0:
+                    listing = asyncio.ensure_future(
+                        self.gmail_service.list_message_page(user["id"], page_params(next_page_token, remaining))
+                    )
+
+                result = await self.gmail_service.fetch_email_details(
+                    user["id"], user["email"], message_ids, request.page_size
+                )
+                stored = await self.email_service.upsert_many(result["emails"], user)
+
+                update = {"$inc": {
+                    "processed": len(message_ids),
+                    "stored": stored,
+                    "failed": len(result["failed"]),
+                    "pages": 1
+                }}
+                if result["failed"]:
+                    update["$push"] = {"errors": {"$each": result["failed"], "$slice": -MAX_JOB_ERRORS}}
+                await self._update(job["_id"], update)
+        finally:
+            if listing is not None:
+                listing.cancel()
+
+        await self._update(job["_id"], {"$set": {"status": "completed", "finished_at": datetime.utcnow()}})
@@ -1,28 +1,80 @@
 # app/services/gmail_service.py
-import base64
+import asyncio
+import itertools
 import uuid
-from bs4 import BeautifulSoup
+import httplib2
 from app.models.email import Email
 from app.models.user import User
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google.auth.exceptions import RefreshError
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 import os
 from ..models.gmail import GmailCredentials, GmailFetchParams
 from ..database import get_database
+from ..config import settings
+from ..concurrency import BlockingExecutor, SingleFlight
+from ..cache import TTLCache
+from .gmail_cache_service import GmailMessageCache
+from .gmail_client_factory import gmail_client_factory
+from .mime_extractor import extract_bodies
+
+# Gmail rejects batch requests with more than 100 calls
+MAX_BATCH_SIZE = 100
+
+# Messages per fetch while streaming, so the first frame is sent quickly
+STREAM_CHUNK_SIZE = 10
+
+# Chunks fetched ahead of a streaming client; a slow reader stops further fetches
+STREAM_WINDOW = 3
+
+# Gmail lists at most 500 messages per page
+MAX_PAGE_SIZE = 500
+
+# Summaries only need a few headers; the fields mask trims everything else from the response
+SUMMARY_GET_KWARGS = {
+    "format": "metadata",
+    "metadataHeaders": ["Subject", "From", "Date"],
+    "fields": "id,snippet,payload/headers"
+}
+
+# Failures worth retrying on a later sync, besides any 5xx: rate limits and an expired
+# or revoked grant (re-linking keeps the cursor). Anything else will fail the same way again.
+RETRYABLE_STATUSES = {401, 403, 429}
+
+# Permanently failed messages kept on the credentials document, newest last
+MAX_SKIPPED_MESSAGES = 100
+
+def _failure(message_id: str, error: str, status: Optional[int] = None, retryable: bool = True) -> dict:
+    return {"id": message_id, "error": error, "status": status, "retryable": retryable}
+
+def _http_failure(message_id: str, error: HttpError) -> dict:
+    status = error.resp.status
+    return _failure(message_id, str(error), status, status in RETRYABLE_STATUSES or status >= 500)
+
+# googleapiclient and google-auth are synchronous, so every Gmail call goes through this pool
+gmail_executor = BlockingExecutor(
+    max_workers=settings.GMAIL_MAX_WORKERS,
+    per_user_limit=settings.GMAIL_USER_CONCURRENCY,
+    timeout=settings.GMAIL_CALL_TIMEOUT,
+    name="gmail"
+)
 
 class GmailService:
     def __init__(self):
         self.credentials_collection = "gmail_credentials"
         self.users_collection = "users"
         self.client_config = self._load_client_config()
+        self.message_cache = GmailMessageCache()
+        self._page_requests = SingleFlight()
+        # Positive auth checks only: an unlinked user must see a fresh link right away
+        self._auth_status = TTLCache(maxsize=settings.GMAIL_AUTH_CACHE_SIZE, ttl=settings.GMAIL_AUTH_CACHE_TTL)
+        self._auth_checks = SingleFlight()
         
     def _load_client_config(self):
         # Load from environment variables or secure storage
@@ -36,18 +88,58 @@ class GmailService:
             }
         }
 
+    def _get_client(self, user_id: str, creds_doc: dict) -> Tuple[object, Credentials]:
+        return gmail_client_factory.gmail_client(user_id, creds_doc, self.client_config)
+
+    async def _load_client(self, user_id: str) -> Tuple[dict, object, Credentials]:
+        """Returns (credentials document, gmail service, credentials) for a linked user."""
+        db = await get_database()
+        creds_doc = await db[self.credentials_collection].find_one({"user_id": user_id})
+        if not creds_doc:
+            raise ValueError("User not authenticated")
+        service, credentials = self._get_client(user_id, creds_doc)
+        return creds_doc, service, credentials
+
+    async def _save_refreshed_token(self, user_id: str, creds_doc: dict, credentials: Credentials) -> None:
+        """Writes a token refreshed by google-auth back, so later requests can skip the refresh."""
+        if credentials.token and credentials.token != creds_doc["access_token"]:
+            db = await get_database()
+            await db[self.credentials_collection].update_one(
+                {"user_id": user_id},
+                {"$set": {"access_token": credentials.token, "token_expiry": credentials.expiry}}
+            )
+
+    def _on_gmail_error(self, user_id: str, error: Exception) -> None:
+        """A rejected real call means the cached auth status can no longer be trusted."""
+        if isinstance(error, RefreshError) or (isinstance(error, HttpError) and error.resp.status in [401, 403]):
+            self._auth_status.pop(user_id)
+
+    async def _remove_credentials(self, user_id: str) -> int:
+        db = await get_database()
+        gmail_client_factory.evict(user_id)
+        self._auth_status.pop(user_id)
+        result = await db[self.credentials_collection].delete_one({"user_id": user_id})
+        return result.deleted_count
+
+    def _authorized_http(self, credentials: Credentials) -> AuthorizedHttp:
+        """httplib2 connections are not thread-safe, so each pooled call gets its own."""
+        return AuthorizedHttp(credentials, http=httplib2.Http(timeout=settings.GMAIL_CALL_TIMEOUT))
+
+    def _fetch_user_info(self, credentials: Credentials) -> dict:
+        service = gmail_client_factory.build("oauth2", "v2", credentials)
+        return service.userinfo().get().execute(http=self._authorized_http(credentials))
+
     async def _get_user_info(self, credentials: Credentials) -> Tuple[str, Optional[str]]:
         """
         Fetch user's email and name from Google API
         Returns tuple of (email, name)
         """
-        service = build("oauth2", "v2", credentials=credentials)
-        user_info = service.userinfo().get().execute()
+        user_info = await gmail_executor.run(None, self._fetch_user_info, credentials)
         return user_info.get("email"), user_info.get("name")
 
     async def store_credentials(self, flow: Flow, code: str) -> Tuple[GmailCredentials, User]:
         # Exchange authorization code
-        flow.fetch_token(code=code)
+        await gmail_executor.run(None, flow.fetch_token, code=code)
         creds = flow.credentials
         email, name = await self._get_user_info(creds)
 
@@ -69,7 +161,7 @@ class GmailService:
         # Instead of {"user_id": user_id}, we use {"email": email} as our unique query
         await db[self.credentials_collection].update_one(
             {"email": email},
-            {"$set": credentials.model_dump()},
+            {"$set": credentials.model_dump(exclude={"history_id"})},  # Re-linking keeps the sync cursor
             upsert=True
         )
 
@@ -86,6 +178,7 @@ class GmailService:
             }
         )
 
+        self._auth_status.pop(existing_user["id"])
         updated_user = await db[self.users_collection].find_one({"email": email})
         return credentials, User(**updated_user)
 
@@ -93,13 +186,24 @@ class GmailService:
         """
         Handle user logout by removing credentials but keeping user account
         """
-        db = await get_database()
         # Only remove credentials, keep user account
-        result = await db[self.credentials_collection].delete_one({"user_id": user_id})
-        if result.deleted_count == 0:
+        if await self._remove_credentials(user_id) == 0:
             raise ValueError("User not found")
+        await self.message_cache.clear(user_id)
 
     async def check_auth(self, user_id: str) -> dict:
+        """
+        Answers from the auth-status cache when possible. Otherwise runs one live
+        check per user, shared by every concurrent caller.
+        """
+        cached = self._auth_status.get(user_id)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        result = await self._auth_checks.run(user_id, lambda: self._verify_auth(user_id))
+        return {**result, "cached": False}
+
+    async def _verify_auth(self, user_id: str) -> dict:
         db = await get_database()
         creds_doc = await db[self.credentials_collection].find_one({"user_id": user_id})
         if not creds_doc:
@@ -109,21 +213,15 @@ class GmailService:
                 "user": None
             }
 
-        credentials = Credentials(
-            token=creds_doc["access_token"],
-            refresh_token=creds_doc["refresh_token"],
-            token_uri=self.client_config["web"]["token_uri"],
-            client_id=self.client_config["web"]["client_id"],
-            client_secret=self.client_config["web"]["client_secret"]
-        )
+        gmail, credentials = self._get_client(user_id, creds_doc)
 
         # Attempt to refresh if needed
         if not credentials.valid:
             try:
-                credentials.refresh(Request())
+                await gmail_executor.run(user_id, credentials.refresh, Request())
             except RefreshError:
                 # Refresh fails => token revoked/expired => remove from DB
-                await db[self.credentials_collection].delete_one({"user_id": user_id})
+                await self._remove_credentials(user_id)
                 return {
                     "isAuthenticated": False,
                     "email": None,
@@ -131,23 +229,30 @@ class GmailService:
                 }
 
         # Now do a test call to ensure it’s *really* valid
+        verified = True
         try:
-            gmail = build("gmail", "v1", credentials=credentials)
-            gmail.users().getProfile(userId="me").execute()  # minimal test call
+            await gmail_executor.run(
+                user_id,
+                gmail.users().getProfile(userId="me").execute,  # minimal test call
+                http=self._authorized_http(credentials)
+            )
         except HttpError as e:
             if e.resp.status in [401, 403]:
                 # Definitely not valid => remove from DB
-                await db[self.credentials_collection].delete_one({"user_id": user_id})
+                await self._remove_credentials(user_id)
                 return {
                     "isAuthenticated": False,
                     "email": None,
                     "user": None
                 }
-            # If it's some other error, you might handle or re-raise
+            # Transient (429, 5xx): the unexpired token still counts, but only a successful call is cached
+            verified = False
+
+        await self._save_refreshed_token(user_id, creds_doc, credentials)
 
         # If we got here, the token is valid
         user_doc = await db[self.users_collection].find_one({"email": creds_doc["email"]})
-        return {
+        result = {
             "isAuthenticated": True,
             "email": creds_doc["email"],
             "user": {
@@ -157,6 +262,9 @@ class GmailService:
                 "created_at": user_doc.get("created_at")
             } if user_doc else None
         }
+        if verified:
+            self._auth_status.set(user_id, result)
+        return result
     
     def create_auth_url(self) -> str:
         flow = Flow.from_client_config(
@@ -180,96 +288,368 @@ class GmailService:
         )
         return auth_url
 
-    def _clean_html(self, html_content: str) -> str:
-        """Strips HTML tags and returns plain text."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        return soup.get_text(separator=' ', strip=True)
+    def _build_email(self, message: dict, body: str, user_id: str, user_email: str) -> Email:
+        """Converts a full-format Gmail message into an Email."""
+        headers = {h["name"]: h["value"] for h in message["payload"]["headers"]}
+        date_str = headers.get("Date", "")
+        try:
+            date = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %z")
+        except ValueError:
+            try:
+                date = datetime.strptime(date_str, "%d %b %Y %H:%M:%S %z")
+            except ValueError:
+                date = datetime.utcnow()
 
-    def _get_email_body(self, message_part) -> str:
-        """Recursively extracts and decodes email body from message parts."""
-        if message_part.get("body", {}).get("data"):
-            data = base64.urlsafe_b64decode(message_part["body"]["data"].encode("UTF-8"))
-            return self._clean_html(data.decode("UTF-8"))
-        
-        if message_part.get("parts"):
-            text_content = []
-            for part in message_part["parts"]:
-                # Prefer text/plain over text/html
-                if part["mimeType"] == "text/plain":
-                    if part["body"].get("data"):
-                        data = base64.urlsafe_b64decode(part["body"]["data"].encode("UTF-8"))
-                        return data.decode("UTF-8")
-                elif part["mimeType"] == "text/html":
-                    if part["body"].get("data"):
-                        data = base64.urlsafe_b64decode(part["body"]["data"].encode("UTF-8"))
-                        text_content.append(self._clean_html(data.decode("UTF-8")))
-                elif part["mimeType"].startswith("multipart/"):
-                    text_content.append(self._get_email_body(part))
-            
-            return "\n".join(filter(None, text_content))
-        
-        return ""
+        return Email(
+            id=message["id"],
+            subject=headers.get("Subject", ""),
+            body=body,
+            sender=headers.get("From", ""),
+            date=date,
+            user_email=user_email,
+            user_id=user_id
+        )
+
+    async def _build_emails(self, raw_messages: List[dict], user_id: str, user_email: str, failures: List[dict]) -> List[Email]:
+        """Parses raw messages, recording the ones that cannot be parsed in failures."""
+        bodies = await extract_bodies([raw.get("payload", {}) for raw in raw_messages])
+        emails = []
+        for raw, (body, error) in zip(raw_messages, bodies):
+            try:
+                if error is not None:
+                    raise ValueError(error)
+                emails.append(self._build_email(raw, body, user_id, user_email))
+            except (KeyError, ValueError) as e:
+                failures.append(_failure(raw.get("id"), f"Failed to parse message: {e}", retryable=False))
+        return emails
+
+    def _fetch_message_chunk(
+        self, service, credentials: Credentials, message_ids: List[str], get_kwargs: dict
+    ) -> Tuple[dict, List[dict]]:
+        """
+        Fetches one chunk of messages, as a single get or one Gmail batch request.
+        Returns tuple of (messages keyed by id, failures)
+        """
+        results = {}
+        failures = []
+        http = self._authorized_http(credentials)
+
+        if len(message_ids) == 1:
+            try:
+                results[message_ids[0]] = service.users().messages().get(
+                    userId="me",
+                    id=message_ids[0],
+                    **get_kwargs
+                ).execute(http=http)
+            except HttpError as e:
+                failures.append(_http_failure(message_ids[0], e))
+            return results, failures
+
+        def on_response(request_id, response, exception):
+            # A failed item must not abort the rest of the batch
+            if isinstance(exception, HttpError):
+                failures.append(_http_failure(request_id, exception))
+            elif exception is not None:
+                failures.append(_failure(request_id, str(exception)))
+            else:
+                results[request_id] = response
+
+        batch = service.new_batch_http_request(callback=on_response)
+        for message_id in message_ids:
+            batch.add(
+                service.users().messages().get(userId="me", id=message_id, **get_kwargs),
+                request_id=message_id
+            )
+        batch.execute(http=http)
+        return results, failures
+
+    async def _fetch_messages(
+        self, user_id: str, service, credentials: Credentials, message_ids: List[str], batch_size: int,
+        get_kwargs: Optional[dict] = None
+    ) -> Tuple[List[dict], List[dict]]:
+        """
+        Fetches messages in parallel chunks of batch_size (1 runs plain gets in parallel).
+        get_kwargs are passed to messages().get and default to the full format.
+        Returns tuple of (messages in listing order, failures)
+        """
+        get_kwargs = get_kwargs or {"format": "full"}
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        chunks = [message_ids[i:i + batch_size] for i in range(0, len(message_ids), batch_size)]
+
+        async def fetch_chunk(chunk: List[str]) -> Tuple[dict, List[dict]]:
+            try:
+                return await gmail_executor.run(
+                    user_id, self._fetch_message_chunk, service, credentials, chunk, get_kwargs
+                )
+            except asyncio.TimeoutError:
+                return {}, [_failure(message_id, "Timed out fetching message") for message_id in chunk]
+            except HttpError as e:
+                return {}, [_http_failure(message_id, e) for message_id in chunk]
+            except RefreshError as e:
+                return {}, [_failure(message_id, str(e), 401) for message_id in chunk]
+            except (httplib2.HttpLib2Error, OSError) as e:
+                # Connection errors: nothing reached Gmail, so the chunk can simply be retried
+                return {}, [_failure(message_id, f"Network error: {e}") for message_id in chunk]
+
+        results = {}
+        failures = []
+        for chunk_results, chunk_failures in await asyncio.gather(*(fetch_chunk(c) for c in chunks)):
+            results.update(chunk_results)
+            failures.extend(chunk_failures)
+
+        return [results[i] for i in message_ids if i in results], failures
+
+    async def _get_emails(
+        self, user_id: str, user_email: str, service, credentials: Credentials, message_ids: List[str], batch_size: int
+    ) -> Tuple[List[Email], List[dict], int]:
+        """
+        Serves messages from the parsed-message cache and fetches only the misses from Gmail.
+        Returns tuple of (emails in listing order, failures, cache hit count)
+        """
+        cached = await self.message_cache.get_many(user_id, message_ids)
+        misses = [message_id for message_id in message_ids if message_id not in cached]
+
+        raw_messages, failures = await self._fetch_messages(user_id, service, credentials, misses, batch_size)
+        if any(f["status"] in [401, 403] for f in failures):
+            self._auth_status.pop(user_id)
+        fetched = await self._build_emails(raw_messages, user_id, user_email, failures)
+        await self.message_cache.put_many(user_id, fetched)
+
+        emails_by_id = {**cached, **{email.id: email for email in fetched}}
+        emails = [emails_by_id[i] for i in message_ids if i in emails_by_id]
+        return emails, failures, len(cached)
 
     async def fetch_emails(self, user_id: str, user_email: str, params: GmailFetchParams) -> dict:
-        db = await get_database()
-        creds_doc = await db[self.credentials_collection].find_one({"user_id": user_id})
-        if not creds_doc:
-            raise ValueError("User not authenticated")
-        
-        credentials = Credentials(
-            token=creds_doc["access_token"],
-            refresh_token=creds_doc["refresh_token"],
-            token_uri=self.client_config["web"]["token_uri"],
-            client_id=self.client_config["web"]["client_id"],
-            client_secret=self.client_config["web"]["client_secret"]
+        # Concurrent requests for the same page (double clicks, re-renders) share one Gmail round trip
+        key = (user_id, self._build_search_query(params), params.page_token, params.limit, params.batch_size)
+        return await self._page_requests.run(key, lambda: self._fetch_email_page(user_id, user_email, params))
+
+    async def _list_message_ids(
+        self, user_id: str, service, credentials: Credentials, params: GmailFetchParams
+    ) -> Tuple[List[str], Optional[str]]:
+        """Returns (ids of one listing page, nextPageToken)."""
+        try:
+            response = await gmail_executor.run(
+                user_id,
+                service.users().messages().list(
+                    userId="me",
+                    q=self._build_search_query(params),
+                    maxResults=params.limit,
+                    pageToken=params.page_token,
+                    fields="messages/id,nextPageToken"
+                ).execute,
+                http=self._authorized_http(credentials)
+            )
+        except (HttpError, RefreshError) as e:
+            self._on_gmail_error(user_id, e)
+            raise
+        return [msg["id"] for msg in response.get("messages", [])], response.get("nextPageToken")
+
+    async def list_message_page(self, user_id: str, params: GmailFetchParams) -> Tuple[List[str], Optional[str]]:
+        """Returns (message ids of one listing page, nextPageToken) without fetching messages."""
+        creds_doc, service, credentials = await self._load_client(user_id)
+        page = await self._list_message_ids(user_id, service, credentials, params)
+        await self._save_refreshed_token(user_id, creds_doc, credentials)
+        return page
+
+    async def _fetch_email_page(self, user_id: str, user_email: str, params: GmailFetchParams) -> dict:
+        creds_doc, service, credentials = await self._load_client(user_id)
+
+        message_ids, next_page_token = await self._list_message_ids(user_id, service, credentials, params)
+        messages, failures, cache_hits = await self._get_emails(
+            user_id, user_email, service, credentials, message_ids, params.batch_size
         )
-        
-        service = build("gmail", "v1", credentials=credentials)
-        query = self._build_search_query(params)
-        
-        response = service.users().messages().list(
-            userId="me",
-            q=query,
-            maxResults=params.limit,
-            pageToken=params.page_token
-        ).execute()
-
-        messages = []
-        for msg in response.get("messages", []):
-            email = service.users().messages().get(
-                userId="me",
-                id=msg["id"],
-                format="full"
-            ).execute()
-            
-            headers = {h["name"]: h["value"] for h in email["payload"]["headers"]}
-            date_str = headers.get("Date", "")
-            try:
-                date = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %z")
-            except ValueError:
-                try:
-                    date = datetime.strptime(date_str, "%d %b %Y %H:%M:%S %z")
-                except ValueError:
-                    date = datetime.utcnow()
-            
-            body = self._get_email_body(email["payload"])
-            
-            messages.append(Email(
-                id=email["id"],
-                subject=headers.get("Subject", ""),
-                body=body,
-                sender=headers.get("From", ""),
-                date=date,
-                user_email=user_email,
-                user_id=user_id
-            ))
+        await self._save_refreshed_token(user_id, creds_doc, credentials)
           
         return {
             "emails": messages,
-            "nextPageToken": response.get("nextPageToken"),
-            "hasMore": bool(response.get("nextPageToken"))
+            "failed": failures,
+            "cache": {"hits": cache_hits, "misses": len(message_ids) - cache_hits},
+            "nextPageToken": next_page_token,
+            "hasMore": bool(next_page_token)
+        }
+
+    async def open_email_stream(self, user_id: str, user_email: str, params: GmailFetchParams) -> AsyncIterator[dict]:
+        """
+        Lists the page up front (so auth and listing errors surface before any
+        response is sent) and returns an iterator of frames: an "email" or
+        "failed" frame per message as soon as its chunk is parsed, then a final
+        "done" frame. At most STREAM_WINDOW chunks are fetched ahead of the reader.
+        """
+        params = params.model_copy(update={"limit": max(1, min(params.limit, MAX_PAGE_SIZE))})
+        creds_doc, service, credentials = await self._load_client(user_id)
+        message_ids, next_page_token = await self._list_message_ids(user_id, service, credentials, params)
+
+        # Small chunks keep time-to-first-email independent of the page size
+        chunk_size = max(1, min(params.batch_size, STREAM_CHUNK_SIZE))
+        chunks = iter([message_ids[i:i + chunk_size] for i in range(0, len(message_ids), chunk_size)])
+
+        async def frames() -> AsyncIterator[dict]:
+            pending = set()
+            try:
+                while True:
+                    # Refill only after the reader took the previous frames
+                    for chunk in itertools.islice(chunks, STREAM_WINDOW - len(pending)):
+                        pending.add(asyncio.ensure_future(
+                            self._get_emails(user_id, user_email, service, credentials, chunk, chunk_size)
+                        ))
+                    if not pending:
+                        break
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        emails, failures, _ = task.result()
+                        for email in emails:
+                            yield {"type": "email", "email": email.model_dump(mode="json")}
+                        for failure in failures:
+                            yield {"type": "failed", **failure}
+                await self._save_refreshed_token(user_id, creds_doc, credentials)
+                yield {"type": "done", "nextPageToken": next_page_token, "hasMore": bool(next_page_token)}
+            finally:
+                # The client may disconnect mid-stream
+                for task in pending:
+                    task.cancel()
+
+        return frames()
+
+    async def list_email_summaries(self, user_id: str, params: GmailFetchParams) -> dict:
+        """
+        Lists one page as lightweight summaries (subject, sender, date, snippet)
+        using the metadata format, without downloading or parsing any body.
+        """
+        creds_doc, service, credentials = await self._load_client(user_id)
+
+        message_ids, next_page_token = await self._list_message_ids(user_id, service, credentials, params)
+        raw_messages, failures = await self._fetch_messages(
+            user_id, service, credentials, message_ids, params.batch_size, get_kwargs=SUMMARY_GET_KWARGS
+        )
+        await self._save_refreshed_token(user_id, creds_doc, credentials)
+
+        return {
+            "emails": [self._parse_email(raw) for raw in raw_messages],
+            "failed": failures,
+            "nextPageToken": next_page_token,
+            "hasMore": bool(next_page_token)
+        }
+
+    async def fetch_email_details(self, user_id: str, user_email: str, message_ids: List[str], batch_size: int = 50) -> dict:
+        """Fetches and parses full bodies for the messages the user selected."""
+        creds_doc, service, credentials = await self._load_client(user_id)
+
+        messages, failures, cache_hits = await self._get_emails(
+            user_id, user_email, service, credentials, message_ids, batch_size
+        )
+        await self._save_refreshed_token(user_id, creds_doc, credentials)
+
+        return {
+            "emails": messages,
+            "failed": failures,
+            "cache": {"hits": cache_hits, "misses": len(message_ids) - cache_hits}
         }
     
+    def _list_history(
+        self, service, credentials: Credentials, start_history_id: str, limit: int
+    ) -> Tuple[List[str], str, bool]:
+        """
+        Walks the history API from start_history_id, stopping after the record
+        that brings the count of changed messages to limit.
+        Returns tuple of (ids of added or relabelled messages, historyId to resume from, more pending)
+        """
+        http = self._authorized_http(credentials)
+        message_ids = {}
+        latest_history_id = start_history_id
+        page_token = None
+        while True:
+            response = service.users().history().list(
+                userId="me",
+                startHistoryId=start_history_id,
+                historyTypes=["messageAdded", "labelAdded"],
+                pageToken=page_token
+            ).execute(http=http)
+
+            for record in response.get("history", []):
+                for change in record.get("messagesAdded", []) + record.get("labelsAdded", []):
+                    # dict keeps first-seen order while de-duplicating
+                    message_ids[change["message"]["id"]] = None
+                if len(message_ids) >= limit:
+                    # Records are whole units of the cursor: resume right after this one
+                    return list(message_ids), record["id"], True
+
+            latest_history_id = response.get("historyId", latest_history_id)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return list(message_ids), latest_history_id, False
+
+    def _list_recent(self, service, credentials: Credentials, limit: int) -> Tuple[List[str], str]:
+        """
+        Starts a fresh cursor: snapshots the mailbox historyId, then lists the latest messages.
+        Returns tuple of (message ids, historyId)
+        """
+        http = self._authorized_http(credentials)
+        # Read the cursor first so nothing that arrives during the listing is missed
+        profile = service.users().getProfile(userId="me").execute(http=http)
+        response = service.users().messages().list(userId="me", maxResults=limit).execute(http=http)
+        return [msg["id"] for msg in response.get("messages", [])], profile["historyId"]
+
+    async def sync_new_emails(self, user_id: str, user_email: str, limit: int = 50, batch_size: int = 50) -> dict:
+        """
+        Returns at most about `limit` messages added or relabelled since the stored
+        historyId cursor; hasMore says another sync would return more. Falls back to
+        a full resync of the latest `limit` messages when there is no cursor yet or
+        Gmail has expired it.
+        """
+        creds_doc, service, credentials = await self._load_client(user_id)
+
+        history_id = creds_doc.get("history_id")
+        full_resync = True
+        has_more = False
+        if history_id:
+            try:
+                message_ids, new_history_id, has_more = await gmail_executor.run(
+                    user_id, self._list_history, service, credentials, history_id, limit
+                )
+                full_resync = False
+            except HttpError as e:
+                # Gmail answers 404 once a historyId is too old to replay
+                if e.resp.status != 404:
+                    self._on_gmail_error(user_id, e)
+                    raise
+            except RefreshError as e:
+                self._on_gmail_error(user_id, e)
+                raise
+
+        if full_resync:
+            try:
+                message_ids, new_history_id = await gmail_executor.run(
+                    user_id, self._list_recent, service, credentials, limit
+                )
+            except (HttpError, RefreshError) as e:
+                self._on_gmail_error(user_id, e)
+                raise
+
+        messages, failures, _ = await self._get_emails(
+            user_id, user_email, service, credentials, message_ids, batch_size
+        )
+
+        await self._save_refreshed_token(user_id, creds_doc, credentials)
+
+        # Keep the old cursor while anything retryable failed, so the next sync picks it up again.
+        # Permanent failures (deleted messages, unparseable MIME) would fail forever: record them and move on.
+        if not any(f["retryable"] for f in failures):
+            update = {"$set": {"history_id": new_history_id}}
+            skipped = [{**f, "skipped_at": datetime.utcnow()} for f in failures]
+            if skipped:
+                update["$push"] = {"skipped_messages": {"$each": skipped, "$slice": -MAX_SKIPPED_MESSAGES}}
+            db = await get_database()
+            await db[self.credentials_collection].update_one({"user_id": user_id}, update)
+
+        return {
+            "emails": messages,
+            "failed": failures,
+            "historyId": new_history_id,
+            "fullResync": full_resync,
+            "hasMore": has_more
+        }
+
     def _build_search_query(self, params: GmailFetchParams) -> str:
         query_parts = []
         
@@ -294,11 +674,11 @@ class GmailService:
         return final_query
 
     def _parse_email(self, email: dict) -> dict:
-        headers = {h["name"]: h["value"] for h in email["payload"]["headers"]}
+        headers = {h["name"]: h["value"] for h in email.get("payload", {}).get("headers", [])}
         return {
             "id": email["id"],
             "subject": headers.get("Subject", ""),
             "from": headers.get("From", ""),
             "date": headers.get("Date", ""),
-            "snippet": email["snippet"]
+            "snippet": email.get("snippet", "")
         }
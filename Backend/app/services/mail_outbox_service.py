@@ -0,0 +1,215 @@
+# app/services/mail_outbox_service.py
+import asyncio
+import logging
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Optional, Tuple
+from pymongo import ReturnDocument
+from ..config import settings
+from ..database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Messages are claimed one at a time, so a claim only has to outlive one send. That send may
+# reconnect once, and each of its SMTP commands can take up to SMTP_TIMEOUT.
+CLAIM_TIMEOUT_COMMANDS = 20
+MAX_RETRY_DELAY_SECONDS = 3600
+
+def _build_message(doc: dict) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = doc["subject"]
+    msg["From"] = settings.EMAIL_ADDRESS
+    msg["To"] = doc["to"]
+    msg.attach(MIMEText(doc["body"], "plain"))
+    return msg
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx replies about the message will fail the same way again; a 5xx login failure is a config problem."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return (
+        isinstance(error, smtplib.SMTPResponseException)
+        and not isinstance(error, smtplib.SMTPAuthenticationError)
+        and error.smtp_code >= 500
+    )
+
+class SMTPConnection:
+    """
+    One authenticated SMTP connection reused across messages. It is reopened
+    when the server drops it or it sat idle longer than SMTP_IDLE_SECONDS.
+    Blocking: only use it from the sender thread.
+    """
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _open(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT)
+        if settings.SMTP_STARTTLS:
+            server.starttls()
+        if settings.EMAIL_PASSWORD:
+            server.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
+        return server
+
+    def send(self, message: MIMEMultipart) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > settings.SMTP_IDLE_SECONDS:
+            self.close()
+        if self._server is None:
+            self._server = self._open()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Servers may drop idle connections sooner than we expect; retry once on a fresh one
+            self.close()
+            self._server = self._open()
+            self._server.send_message(message)
+        finally:
+            # A rejected message used the session too
+            self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+class MailOutboxService:
+    """
+    Durable outbox for outgoing mail. Requests only insert into mail_outbox;
+    a background task claims due messages one at a time, sends them over one
+    reused SMTP connection and reschedules temporary failures with exponential
+    backoff. Bodies can hold reset links, so they are dropped once a message is
+    sent or given up on.
+    """
+    def __init__(self):
+        self.collection_name = "mail_outbox"
+        self._connection = SMTPConnection()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    async def enqueue(self, to_address: str, subject: str, body: str) -> str:
+        collection = await self.get_collection()
+        now = datetime.utcnow()
+        result = await collection.insert_one({
+            "to": to_address,
+            "subject": subject,
+            "body": body,
+            "status": "pending",
+            "attempts": 0,
+            "last_error": None,
+            "created_at": now,
+            "next_attempt_at": now,
+            "claimed_at": None,
+            "sent_at": None
+        })
+        if self._wake is not None:
+            self._wake.set()
+        return str(result.inserted_id)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._connection.close)
+
+    async def _claim(self) -> Optional[dict]:
+        """Atomically marks the next due message as sending, so other instances skip it."""
+        collection = await self.get_collection()
+        now = datetime.utcnow()
+        claim_timeout = timedelta(seconds=settings.SMTP_TIMEOUT * CLAIM_TIMEOUT_COMMANDS)
+        due = {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "sending", "claimed_at": {"$lt": now - claim_timeout}}
+        ]}
+        return await collection.find_one_and_update(
+            due,
+            {"$set": {"status": "sending", "claimed_at": now}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _send(self, doc: dict) -> Optional[Tuple[str, bool]]:
+        """Runs on the sender thread; returns the error and whether it is permanent, None when sent."""
+        try:
+            self._connection.send(_build_message(doc))
+            return None
+        except smtplib.SMTPServerDisconnected as e:
+            self._connection.close()
+            return str(e), False
+        except smtplib.SMTPException as e:
+            # A refused recipient or message only fails this row; smtplib has reset the session for the next one
+            return str(e), _is_permanent(e)
+        except OSError as e:
+            # Checked after SMTPException, which subclasses it: only socket errors break the session
+            self._connection.close()
+            return str(e), False
+
+    def _result_update(self, doc: dict, result: Optional[Tuple[str, bool]], now: datetime) -> dict:
+        if result is None:
+            return {"status": "sent", "sent_at": now, "last_error": None, "body": None}
+        error, permanent = result
+        attempts = doc["attempts"] + 1
+        if permanent or attempts >= settings.SMTP_MAX_ATTEMPTS:
+            logger.error(f"Giving up on mail {doc['_id']} to {doc['to']} after {attempts} attempts: {error}")
+            return {"status": "failed", "attempts": attempts, "last_error": error, "body": None}
+        delay = min(settings.SMTP_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+        return {
+            "status": "pending",
+            "attempts": attempts,
+            "last_error": error,
+            "next_attempt_at": now + timedelta(seconds=delay)
+        }
+
+    async def process_batch(self) -> int:
+        """Sends up to SMTP_BATCH_SIZE due messages and returns how many were attempted."""
+        collection = await self.get_collection()
+        loop = asyncio.get_running_loop()
+        attempted = 0
+        while attempted < settings.SMTP_BATCH_SIZE:
+            doc = await self._claim()
+            if doc is None:
+                break
+            result = await loop.run_in_executor(self._executor, self._send, doc)
+            update = self._result_update(doc, result, datetime.utcnow())
+            await collection.update_one({"_id": doc["_id"]}, {"$set": update})
+            attempted += 1
+        return attempted
+
+    async def _run(self) -> None:
+        while True:
+            # Cleared before claiming, so a message enqueued meanwhile still wakes the next wait
+            self._wake.clear()
+            try:
+                if await self.process_batch():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Mail outbox batch failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.MAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+mail_outbox = MailOutboxService()
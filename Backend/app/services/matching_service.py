@@ -0,0 +1,179 @@
+# app/services/matching_service.py
+import re
+from collections import defaultdict
+from typing import Dict, List, Set
+from ..models.email import ApplicationMatch, EmailMatchInput, EmailMatchResult
+from ..database import get_database
+from ..config import settings
+from ..cache import TTLCache
+from ..concurrency import SingleFlight
+from .data_version_service import DataVersionService
+
+WORD = re.compile(r"[a-z0-9]+")
+EMAIL_ADDRESS = re.compile(r"[\w.+-]+@([\w-]+(?:\.[\w-]+)+)")
+# Legal suffixes and filler that say nothing about which company it is
+COMPANY_STOPWORDS = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc", "the", "group"}
+POSITION_STOPWORDS = {"and", "or", "of", "the", "a", "an", "for", "to", "in", "at", "i", "ii", "iii", "sr", "jr"}
+# Sender domain labels shared by many companies (mail providers, TLDs, ATS and mailer subdomains)
+GENERIC_DOMAIN_LABELS = {
+    "com", "org", "net", "io", "co", "ai", "uk", "de", "ca", "us", "eu",
+    "gmail", "googlemail", "outlook", "hotmail", "yahoo", "icloud",
+    "mail", "email", "jobs", "careers", "hire", "talent", "recruiting", "notifications", "no-reply", "noreply",
+    "greenhouse", "lever", "workday", "myworkday", "myworkdayjobs", "smartrecruiters", "ashbyhq", "icims", "taleo"
+}
+# Body text considered for company and position signals
+MAX_BODY_CHARS = 4000
+
+DOMAIN_WEIGHT = 0.5
+COMPANY_WEIGHT = 0.35
+POSITION_WEIGHT = 0.15
+
+def _words(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+def _company_key(company: str) -> str:
+    return "".join(word for word in _words(company) if word not in COMPANY_STOPWORDS)
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _UserIndex:
+    """Token and trigram index over one user's applications, updated in place."""
+    def __init__(self):
+        self.apps: Dict[str, dict] = {}
+        self.by_trigram: Dict[str, Set[str]] = defaultdict(set)
+        self.by_company_key: Dict[str, Set[str]] = defaultdict(set)
+        # Every write at or below this seq is reflected in the index
+        self.seq = 0
+
+    def upsert(self, app: dict) -> None:
+        app_id = str(app["_id"])
+        self.remove(app_id)
+        key = _company_key(app.get("company", ""))
+        entry = {
+            "id": app_id,
+            "company": app.get("company", ""),
+            "position": app.get("position", ""),
+            "company_key": key,
+            "trigrams": _trigrams(key) if key else set(),
+            "position_words": {w for w in _words(app.get("position", "")) if w not in POSITION_STOPWORDS}
+        }
+        self.apps[app_id] = entry
+        for trigram in entry["trigrams"]:
+            self.by_trigram[trigram].add(app_id)
+        if key:
+            self.by_company_key[key].add(app_id)
+
+    def remove(self, app_id: str) -> None:
+        entry = self.apps.pop(app_id, None)
+        if entry is None:
+            return
+        for trigram in entry["trigrams"]:
+            self.by_trigram[trigram].discard(app_id)
+        self.by_company_key[entry["company_key"]].discard(app_id)
+
+class MatchingService:
+    """
+    Scores emails against a user's applications by sender domain, company-name
+    similarity (normalized tokens and a trigram index) and position keywords.
+    Each user's index is built once and then refreshed incrementally from the
+    applications and delete tombstones with a server-assigned seq above the
+    index's own.
+    """
+    def __init__(self):
+        self.collection_name = "applications"
+        # Rebuilt before the tombstones it relies on for deletions can expire
+        self._indexes = TTLCache(maxsize=settings.MATCH_INDEX_MAX_USERS, ttl=settings.SYNC_TOMBSTONE_TTL_SECONDS)
+        self._refreshes = SingleFlight()
+        self.data_versions = DataVersionService()
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    async def _get_index(self, user_email: str) -> _UserIndex:
+        return await self._refreshes.run(user_email, lambda: self._refresh(user_email))
+
+    async def _refresh(self, user_email: str) -> _UserIndex:
+        db = await get_database()
+        collection = db[self.collection_name]
+        index = self._indexes.get(user_email)
+        projection = {"company": 1, "position": 1}
+        # Read before the documents, like a sync token: writes above it are read again next time
+        committed = await self.data_versions.committed_seq(user_email)
+
+        if index is None:
+            index = _UserIndex()
+            async for app in collection.find({"user_email": user_email}, projection):
+                index.upsert(app)
+            index.seq = committed
+            self._indexes.set(user_email, index)
+            return index
+        if committed == index.seq:
+            return index
+
+        async for tombstone in db["sync_tombstones"].find(
+            {"user_email": user_email, "collection": self.collection_name, "seq": {"$gt": index.seq}}
+        ):
+            if tombstone.get("reset"):
+                self._indexes.pop(user_email)
+                return await self._refresh(user_email)
+            index.remove(tombstone["id"])
+        async for app in collection.find({"user_email": user_email, "seq": {"$gt": index.seq}}, projection):
+            index.upsert(app)
+        index.seq = committed
+        return index
+
+    def _score(self, index: _UserIndex, email: EmailMatchInput, top_k: int) -> List[ApplicationMatch]:
+        scores: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+        match = EMAIL_ADDRESS.search(email.sender)
+        if match:
+            for label in match.group(1).lower().split("."):
+                if label in GENERIC_DOMAIN_LABELS:
+                    continue
+                for app_id in index.by_company_key.get(label.replace("-", ""), ()):
+                    scores[app_id]["domain"] = DOMAIN_WEIGHT
+
+        text = f"{email.sender} {email.subject} {email.body[:MAX_BODY_CHARS]}"
+        words = set(_words(text))
+        email_trigrams = set()
+        for word in words:
+            email_trigrams |= _trigrams(word)
+        # Concatenated neighbours catch multi-word names like "Acme Robotics" -> "acmerobotics"
+        ordered = _words(text)
+        for first, second in zip(ordered, ordered[1:]):
+            email_trigrams |= _trigrams(first + second)
+
+        shared: Dict[str, int] = defaultdict(int)
+        for trigram in email_trigrams:
+            for app_id in index.by_trigram.get(trigram, ()):
+                shared[app_id] += 1
+        for app_id, count in shared.items():
+            containment = count / len(index.apps[app_id]["trigrams"])
+            if containment >= 0.6:
+                scores[app_id]["company"] = round(COMPANY_WEIGHT * containment, 4)
+
+        for app_id in list(scores):
+            position_words = index.apps[app_id]["position_words"]
+            if position_words:
+                overlap = len(position_words & words) / len(position_words)
+                if overlap:
+                    scores[app_id]["position"] = round(POSITION_WEIGHT * overlap, 4)
+
+        ranked = sorted(scores.items(), key=lambda item: sum(item[1].values()), reverse=True)[:top_k]
+        return [
+            ApplicationMatch(
+                application_id=app_id,
+                company=index.apps[app_id]["company"],
+                position=index.apps[app_id]["position"],
+                score=round(sum(reasons.values()), 4),
+                reasons=reasons
+            )
+            for app_id, reasons in ranked
+        ]
+
+    async def match(self, user_email: str, emails: List[EmailMatchInput], top_k: int = 5) -> List[EmailMatchResult]:
+        index = await self._get_index(user_email)
+        return [EmailMatchResult(email_id=email.id, matches=self._score(index, email, top_k)) for email in emails]
@@ -0,0 +1,147 @@
+# app/services/mime_extractor.py
+import asyncio
+import base64
+import codecs
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+from ..config import settings
+
+# Multiple of 4 so every chunk is independently decodable base64
+DECODE_CHUNK_SIZE = 64 * 1024
+SKIPPED_TAGS = {"script", "style", "head"}
+CHARSET_PATTERN = re.compile(r'charset\s*=\s*"?([^";\s]+)', re.IGNORECASE)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects visible text while tokenizing, without building a document tree.
+    Output matches BeautifulSoup's get_text(separator=' ', strip=True), minus
+    script and style contents.
+    """
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.full = False
+        self._parts: List[str] = []
+        self._size = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth or self.full:
+            return
+        text = data.strip()
+        if text:
+            self._parts.append(text)
+            self._size += len(text) + 1
+            self.full = self._size >= self.max_chars
+
+    def text(self) -> str:
+        return " ".join(self._parts)[:self.max_chars]
+
+def _charset(part: dict) -> str:
+    """Reads the charset of a part, falling back to UTF-8 when missing or unknown."""
+    for header in part.get("headers", []):
+        if header["name"].lower() == "content-type":
+            match = CHARSET_PATTERN.search(header["value"])
+            if match:
+                try:
+                    return codecs.lookup(match.group(1)).name
+                except LookupError:
+                    break
+    return "utf-8"
+
+def _decoded_chunks(part: dict):
+    """Yields the text of a part chunk by chunk, so huge bodies are never decoded at once."""
+    data = part["body"]["data"]
+    decoder = codecs.getincrementaldecoder(_charset(part))(errors="replace")
+    for start in range(0, len(data), DECODE_CHUNK_SIZE):
+        chunk = data[start:start + DECODE_CHUNK_SIZE]
+        if start + DECODE_CHUNK_SIZE >= len(data):
+            chunk += "=" * (-len(chunk) % 4)  # Gmail sometimes drops the padding
+        yield decoder.decode(base64.urlsafe_b64decode(chunk))
+    yield decoder.decode(b"", final=True)
+
+def _html_to_text(part: dict, max_chars: int) -> str:
+    parser = _TextExtractor(max_chars)
+    for text in _decoded_chunks(part):
+        parser.feed(text)
+        if parser.full:
+            break
+    parser.close()
+    return parser.text()
+
+def _plain_text(part: dict, max_chars: int) -> str:
+    pieces = []
+    size = 0
+    for text in _decoded_chunks(part):
+        pieces.append(text)
+        size += len(text)
+        if size >= max_chars:
+            break
+    return "".join(pieces)[:max_chars]
+
+def extract_body(payload: dict, max_chars: Optional[int] = None) -> str:
+    """Recursively extracts the readable body of a Gmail message payload, preferring text/plain."""
+    max_chars = max_chars or settings.MIME_MAX_BODY_CHARS
+
+    if payload.get("body", {}).get("data"):
+        if payload.get("mimeType") == "text/plain":
+            return _plain_text(payload, max_chars).strip()
+        return _html_to_text(payload, max_chars)
+
+    if payload.get("parts"):
+        text_content = []
+        for part in payload["parts"]:
+            if part["mimeType"] == "text/plain":
+                if part["body"].get("data"):
+                    return _plain_text(part, max_chars)
+            elif part["mimeType"] == "text/html":
+                if part["body"].get("data"):
+                    text_content.append(_html_to_text(part, max_chars))
+            elif part["mimeType"].startswith("multipart/"):
+                text_content.append(extract_body(part, max_chars))
+
+        return "\n".join(filter(None, text_content))
+
+    return ""
+
+def _extract_or_error(payload: dict) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        return extract_body(payload), None
+    except (KeyError, ValueError) as e:
+        return None, str(e)
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.MIME_PROCESS_POOL_WORKERS)
+    return _process_pool
+
+async def extract_bodies(payloads: List[dict]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Extracts many bodies, returning (body, error) per payload. Batches of at least
+    MIME_PROCESS_POOL_THRESHOLD payloads go to a process pool (0 disables it).
+    """
+    threshold = settings.MIME_PROCESS_POOL_THRESHOLD
+    if threshold and len(payloads) >= threshold:
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool()
+        return await asyncio.gather(*(loop.run_in_executor(pool, _extract_or_error, p) for p in payloads))
+    return [_extract_or_error(payload) for payload in payloads]
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
@@ -0,0 +1,42 @@
+# app/services/password_hasher.py
+import asyncio
+import bcrypt
+from typing import Optional
+from fastapi import HTTPException
+from ..concurrency import BlockingExecutor
+from ..config import settings
+
+# bcrypt takes tens to hundreds of milliseconds per call, so it never runs on the event loop.
+# One call at a time per account keeps a burst against one email from taking every worker.
+password_executor = BlockingExecutor(
+    max_workers=settings.BCRYPT_MAX_WORKERS,
+    per_user_limit=1,
+    timeout=settings.BCRYPT_TIMEOUT,
+    name="bcrypt"
+)
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+def _check(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+async def _run(key: Optional[str], fn, *args):
+    try:
+        return await password_executor.run(key, fn, *args)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Server is busy, please try again.")
+
+async def hash_password(password: str, key: Optional[str] = None) -> str:
+    """Hashes with the configured BCRYPT_ROUNDS; key (e.g. the email) serializes calls per account."""
+    return await _run(key, _hash, password, settings.BCRYPT_ROUNDS)
+
+async def verify_password(password: str, hashed: str, key: Optional[str] = None) -> bool:
+    return await _run(key, _check, password, hashed)
+
+def needs_rehash(hashed: str) -> bool:
+    """True when a hash was made with a different work factor than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
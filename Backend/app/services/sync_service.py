@@ -0,0 +1,107 @@
+# app/services/sync_service.py
+import base64
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+from ..models.application import ApplicationList
+from ..models.email import EmailList
+from ..models.sync import ApplicationChanges, EmailChanges, SyncChanges
+from ..database import get_database
+from ..config import settings
+from ..serialization import with_ids
+from .data_version_service import DataVersionService
+
+SYNCED_COLLECTIONS = ("applications", "emails")
+
+class SyncService:
+    """
+    Delta sync over applications and emails. Writes stamp documents with the
+    user's seq counter and deletes leave tombstones, or a single reset marker
+    for a delete_all. Tombstones expire after SYNC_TOMBSTONE_TTL_SECONDS, so
+    older tokens fall back to a full resync.
+    """
+    def __init__(self):
+        self.collection_name = "sync_tombstones"
+        self.data_versions = DataVersionService()
+
+    async def get_collection(self):
+        db = await get_database()
+        return db[self.collection_name]
+
+    async def record_deleted(self, user_email: str, collection_name: str, ids: Iterable[str], seq: int) -> None:
+        now = datetime.utcnow()
+        tombstones = [
+            {"user_email": user_email, "collection": collection_name, "id": id, "seq": seq, "deleted_at": now}
+            for id in ids
+        ]
+        if tombstones:
+            collection = await self.get_collection()
+            await collection.insert_many(tombstones, ordered=False)
+
+    async def record_reset(self, user_email: str, collection_name: str, seq: int) -> None:
+        collection = await self.get_collection()
+        # A reset supersedes every earlier tombstone of the collection
+        await collection.delete_many({"user_email": user_email, "collection": collection_name, "seq": {"$lt": seq}})
+        await collection.insert_one({
+            "user_email": user_email,
+            "collection": collection_name,
+            "id": None,
+            "reset": True,
+            "seq": seq,
+            "deleted_at": datetime.utcnow()
+        })
+
+    def _encode_token(self, seq: int) -> str:
+        raw = f"{seq}|{datetime.utcnow().isoformat()}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def _decode_token(self, token: str) -> Tuple[int, datetime]:
+        try:
+            seq, issued_at = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+            return int(seq), datetime.fromisoformat(issued_at)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid sync token")
+
+    async def changes(self, user_email: str, since: Optional[str] = None) -> SyncChanges:
+        """
+        Applications and emails written after since, plus the ids deleted since
+        then. Without a usable token every collection is reset and sent in full.
+        """
+        since_seq = None
+        if since:
+            since_seq, issued_at = self._decode_token(since)
+            if datetime.utcnow() - issued_at > timedelta(seconds=settings.SYNC_TOMBSTONE_TTL_SECONDS):
+                since_seq = None  # Tombstones of that period may already be gone
+
+        # Read before the documents: every write up to this seq has committed, so the queries see it.
+        # Writes above it may or may not show up now and are sent again on the next sync.
+        token = self._encode_token(await self.data_versions.committed_seq(user_email))
+
+        query = {"user_email": user_email}
+        resets = set(SYNCED_COLLECTIONS)
+        deleted = {name: [] for name in SYNCED_COLLECTIONS}
+        if since_seq is not None:
+            query["seq"] = {"$gt": since_seq}
+            resets = set()
+            tombstones = await self.get_collection()
+            async for tombstone in tombstones.find({"user_email": user_email, "seq": {"$gt": since_seq}}):
+                if tombstone.get("reset"):
+                    resets.add(tombstone["collection"])
+                else:
+                    deleted[tombstone["collection"]].append(tombstone["id"])
+
+        db = await get_database()
+        applications = await db["applications"].find(query).to_list(None)
+        emails = await db["emails"].find(query).to_list(None)
+        return SyncChanges(
+            token=token,
+            applications=ApplicationChanges(
+                reset="applications" in resets,
+                upserted=ApplicationList.validate_python(with_ids(applications)),
+                deleted=deleted["applications"]
+            ),
+            emails=EmailChanges(
+                reset="emails" in resets,
+                upserted=EmailList.validate_python(with_ids(emails)),
+                deleted=deleted["emails"]
+            )
+        )
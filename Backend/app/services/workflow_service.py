@@ -4,13 +4,16 @@ from fastapi import HTTPException
 from app.database import get_database
 from bson import ObjectId
 from typing import List, Optional, Dict
-from ..models.workflow import Workflow, WorkflowStage
+from ..models.workflow import Workflow, WorkflowList, WorkflowStage
+from ..serialization import with_ids
+from .data_version_service import DataVersionService
 
 logger = logging.getLogger(__name__)
 
 class WorkflowService:
     def __init__(self):
         self.collection_name = "workflows"
+        self.data_versions = DataVersionService()
 
     async def get_collection(self):
         db = await get_database()
@@ -18,11 +21,8 @@ class WorkflowService:
 
     async def get_all(self, user: Dict) -> List[Workflow]:
         collection = await self.get_collection()
-        workflows = []
-        async for wf in collection.find({"user_email": user["email"]}):
-            wf["id"] = str(wf.pop("_id"))
-            workflows.append(Workflow(**wf))
-        return workflows
+        docs = await collection.find({"user_email": user["email"]}).to_list(None)
+        return WorkflowList.validate_python(with_ids(docs))
 
     async def get_default(self, user: Dict) -> Optional[Workflow]:
         collection = await self.get_collection()
@@ -87,10 +87,11 @@ class WorkflowService:
         
         try:
             await collection.insert_one(workflow_dict)
-            return workflow
         except Exception as e:
             logger.error(f"Failed to create workflow: {e}")
             return None
+        await self.data_versions.bump(user["email"])
+        return workflow
         
     async def get_by_id(self, workflow_id: str, user: Dict) -> Optional[Workflow]:
         collection = await self.get_collection()
@@ -119,6 +120,7 @@ class WorkflowService:
             workflow_dict
         )
         if result.modified_count:
+            await self.data_versions.bump(user["email"])
             workflow.id = workflow_id
             return workflow
         return None
@@ -129,6 +131,8 @@ class WorkflowService:
             "_id": ObjectId(workflow_id),
             "user_email": user["email"]
         })
+        if result.deleted_count:
+            await self.data_versions.bump(user["email"])
         return result.deleted_count > 0
 
     async def create_initial_workflow(self, user: Dict) -> Optional[Workflow]:
@@ -152,4 +156,6 @@ class WorkflowService:
     async def delete_all(self, user_email: str) -> bool:
         collection = await self.get_collection()
         result = await collection.delete_many({"user_email": user_email})
+        if result.deleted_count:
+            await self.data_versions.bump(user_email)
         return result.deleted_count > 0
\ No newline at end of file
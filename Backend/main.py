@@ -1,8 +1,13 @@
 from app.config import settings
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import applications, workflow, email, gmail, auth
+from app.routers import applications, workflow, email, gmail, auth, analytics, sync
 from app.database import init_db, get_database
+from app.services.gmail_service import gmail_executor
+from app.services.mime_extractor import shutdown_process_pool
+from app.middleware.auth import user_cache_stats
+from app.services.password_hasher import password_executor
+from app.services.mail_outbox_service import mail_outbox
 import logging
 
 # Setup logging
@@ -29,6 +34,8 @@ app.include_router(workflow.router, prefix="/api/workflow", tags=["workflow"])
 app.include_router(email.router, prefix="/api/emails", tags=["email"])
 app.include_router(gmail.router, prefix="/api/gmail", tags=["gmail"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
 
 @app.on_event("startup")
 async def startup():
@@ -38,6 +45,20 @@ async def startup():
         logger.info("Database initialization completed")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
+    mail_outbox.start()
+    try:
+        await gmail.gmail_import_service.start()
+    except Exception as e:
+        logger.error(f"Failed to recover Gmail import jobs: {e}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    logger.info("Shutting down FastAPI application")
+    await mail_outbox.stop()
+    await gmail.gmail_import_service.stop()
+    gmail_executor.shutdown()
+    password_executor.shutdown()
+    shutdown_process_pool()
 
 @app.get("/api")
 async def read_root():
@@ -47,6 +68,8 @@ async def read_root():
         db = await get_database()
         collections = await db.list_collection_names()
         logger.info(f"Database connection test successful. Collections: {collections}")
+        # Operational only, so it goes to the log rather than this unauthenticated response
+        logger.info(f"Auth user cache: {user_cache_stats()}")
         return {
             "message": "Welcome to Job Tracker API",
             "status": "healthy",
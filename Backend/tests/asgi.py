@@ -0,0 +1,64 @@
+# tests/asgi.py
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+@dataclass
+class Response:
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self):
+        return json.loads(self.body)
+
+async def request(
+    app, method: str, url: str, json_body=None, headers: Optional[Dict[str, str]] = None, client: str = "127.0.0.1"
+) -> Response:
+    """Sends one request straight to an ASGI app, without a network or an HTTP client library."""
+    parts = urlsplit(url)
+    headers = dict(headers or {})
+    body = b""
+    if json_body is not None:
+        body = json.dumps(json_body).encode()
+        headers.setdefault("content-type", "application/json")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": (client, 50000),
+        "server": ("testserver", 80),
+    }
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+    finished = asyncio.Event()
+
+    async def receive():
+        if pending:
+            return pending.pop(0)
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    response = Response(status_code=0)
+    chunks = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response.status_code = message["status"]
+            response.headers = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                finished.set()
+
+    await app(scope, receive, send)
+    response.body = b"".join(chunks)
+    return response
@@ -0,0 +1,52 @@
+# tests/conftest.py
+import os
+
+# Settings are read at import time, so the required variables must exist before the app is imported
+for name, value in {
+    "GMAIL_CLIENT_ID": "test-client-id",
+    "GMAIL_CLIENT_SECRET": "test-client-secret",
+    "GMAIL_REDIRECT_URI": "http://localhost:8000/api/gmail/auth/callback",
+    "FRONTEND_URL": "http://localhost:3000",
+    "JWT_SECRET": "test-secret",
+    "EMAIL_ADDRESS": "noreply@example.com",
+    "EMAIL_PASSWORD": "test-password",
+}.items():
+    os.environ.setdefault(name, value)
+
+import mongomock.collection
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from app import database
+from app.middleware.auth import get_current_user
+
+# mongomock does not know the sort option pymongo 4.11 added to bulk UpdateOne
+_add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+def _add_update_without_sort(self, *args, sort=None, **kwargs):
+    return _add_update(self, *args, **kwargs)
+
+mongomock.collection.BulkOperationBuilder.add_update = _add_update_without_sort
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session: the module-level executors and locks bind to it
+    return "asyncio"
+
+@pytest.fixture
+async def db():
+    """An empty in-memory database behind get_database."""
+    database.db.client = AsyncMongoMockClient()
+    yield await database.get_database()
+    database.db.client = None
+
+@pytest.fixture
+def app():
+    import main
+    yield main.app
+    main.app.dependency_overrides.clear()
+
+@pytest.fixture
+def current_user(app):
+    user = {"id": "user-1", "name": "Test User", "email": "user@example.com", "created_at": None}
+    app.dependency_overrides[get_current_user] = lambda: user
+    return user
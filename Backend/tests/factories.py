@@ -0,0 +1,27 @@
+# tests/factories.py
+from datetime import datetime, timedelta
+from app.models.application import Application, ApplicationLog
+
+def make_application(user: dict, i: int = 0, logs: int = 0, **fields) -> Application:
+    date = datetime(2024, 1, 1) + timedelta(hours=i)
+    values = dict(
+        user_id=user["id"],
+        user_email=user["email"],
+        company=f"Company {i}",
+        position="Software Engineer",
+        dateApplied=date,
+        stage="Applied",
+        type="Full-time",
+        tags=["Remote", "Python"],
+        lastUpdated=date,
+        description="Build and run the services behind the product. " * 5,
+        location="Berlin",
+        logs=[
+            ApplicationLog(
+                id=f"log-{i}-{n}", date=date, toStage="Applied", message="Applied online", source="manual"
+            )
+            for n in range(logs)
+        ],
+    )
+    values.update(fields)
+    return Application(**values)
@@ -0,0 +1,103 @@
+# tests/fake_gmail.py
+import base64
+import json
+import threading
+import uuid
+from email.parser import FeedParser
+from typing import Iterable
+from urllib.parse import unquote, urlsplit
+import httplib2
+from google.oauth2.credentials import Credentials
+from app.services.gmail_client_factory import gmail_client_factory
+
+def _b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+def fake_message(message_id: str) -> dict:
+    """A full-format Gmail message with a plain-text body."""
+    return {
+        "id": message_id,
+        "snippet": f"Snippet {message_id}",
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "Subject", "value": f"Subject {message_id}"},
+                {"name": "From", "value": "Recruiter <jobs@example.com>"},
+                {"name": "Date", "value": "Mon, 02 Jan 2023 10:00:00 +0000"},
+            ],
+            "body": {"data": _b64(f"Body of {message_id}")},
+        },
+    }
+
+class StubGmailTransport:
+    """
+    httplib2-compatible transport that answers Gmail messages.get calls, single
+    or inside a batch request, from memory; ids in `missing` answer 404. Round
+    trips block until `gate` is set, standing in for the network, and the
+    transport counts how many are in flight at once.
+    """
+    def __init__(self, message_ids: Iterable[str] = (), missing: Iterable[str] = ()):
+        self.messages = {message_id: fake_message(message_id) for message_id in message_ids}
+        self.missing = set(missing)
+        self.round_trips = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def _message_response(self, path: str):
+        message_id = unquote(path.rsplit("/", 1)[-1])
+        if message_id in self.missing or message_id not in self.messages:
+            return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}
+        return 200, self.messages[message_id]
+
+    def _batch_response(self, body: str, content_type: str):
+        parser = FeedParser()
+        parser.feed(f"content-type: {content_type}\r\n\r\n{body}")
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in parser.close().get_payload():
+            request_line = part.get_payload().split("\n", 1)[0]
+            status, payload = self._message_response(urlsplit(request_line.split(" ")[1]).path)
+            content_id = part["Content-ID"]
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id[1:]}\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n{json.dumps(payload)}\r\n"
+            )
+        content = "".join(parts) + f"--{boundary}--\r\n"
+        return f"multipart/mixed; boundary={boundary}", content
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        with self._lock:
+            self.round_trips += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            self.gate.wait()
+            return self._respond(uri, body, headers)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _respond(self, uri, body, headers):
+        path = urlsplit(uri).path
+        if path == "/batch" or path.startswith("/batch/"):
+            content_type, content = self._batch_response(body, headers["content-type"])
+            return httplib2.Response({"status": "200", "content-type": content_type}), content.encode()
+
+        status, payload = self._message_response(path)
+        return (
+            httplib2.Response({"status": str(status), "content-type": "application/json"}),
+            json.dumps(payload).encode(),
+        )
+
+def stub_gmail_client(monkeypatch, gmail_service, transport: StubGmailTransport):
+    """
+    Builds a real Gmail API client and routes every call gmail_service makes to transport.
+    Returns (service, credentials)
+    """
+    credentials = Credentials(token="test-token")
+    monkeypatch.setattr(gmail_service, "_authorized_http", lambda _credentials: transport)
+    return gmail_client_factory.build("gmail", "v1", credentials), credentials
@@ -0,0 +1,68 @@
+# tests/fake_smtp.py
+import socketserver
+import threading
+from typing import Dict, List
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    A minimal plain-text SMTP server on localhost. rejections maps a recipient
+    to the RCPT reply it gets instead of 250, e.g. "550 No such user".
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rejections: Dict[str, str] = None):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.rejections = rejections or {}
+        self.received: List[str] = []
+        self.connections = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        self.reply("220 stub ESMTP")
+        recipients = []
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 stub")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip().strip("<>")
+                rejection = self.server.rejections.get(address)
+                if rejection:
+                    self.reply(rejection)
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                for line in self.rfile:
+                    if line == b".\r\n":
+                        break
+                self.server.received.extend(recipients)
+                self.reply("250 Queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
@@ -0,0 +1,85 @@
+# tests/test_application_transfer.py
+import csv
+import io
+import pytest
+from app.services.application_service import ApplicationService
+from tests.factories import make_application
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "user-1", "name": "Test User", "email": "user@example.com"}
+OTHER = {"id": "user-2", "name": "Other User", "email": "other@example.com"}
+
+async def export_text(service: ApplicationService, user: dict, format: str) -> str:
+    return "".join([chunk async for chunk in service.export(user["email"], format)])
+
+async def test_csv_export_escapes_formulas_and_import_restores_them(db):
+    service = ApplicationService()
+    await service.create(make_application(USER, company="=HYPERLINK(\"http://evil\")", notes="@SUM(A1)", salary="-5"), USER)
+
+    exported = await export_text(service, USER, "csv")
+    row = next(csv.DictReader(io.StringIO(exported)))
+    assert row["company"] == "'=HYPERLINK(\"http://evil\")"
+    assert row["notes"] == "'@SUM(A1)"
+    assert row["salary"] == "'-5"
+
+    await service.delete_all(USER["email"])
+    result = await service.import_file(io.BytesIO(exported.encode()), "csv", USER)
+    [imported] = await service.get_all(USER["email"])
+    assert result.inserted == 1
+    assert (imported.company, imported.notes, imported.salary) == ("=HYPERLINK(\"http://evil\")", "@SUM(A1)", "-5")
+
+async def test_import_never_takes_the_client_id(db):
+    service = ApplicationService()
+    victim = await service.create(make_application(OTHER), OTHER)
+    row = make_application(USER).model_dump_json(exclude={"id"})[:-1] + f', "id": "{victim.id}"}}'
+
+    result = await service.import_file(io.BytesIO(row.encode()), "ndjson", USER)
+
+    [imported] = await service.get_all(USER["email"])
+    assert result.inserted == 1
+    assert imported.id != victim.id
+    stored = await (await service.get_collection()).find_one({"user_email": USER["email"]})
+    assert stored["imported_id"] == victim.id
+
+async def test_reimporting_a_backup_skips_existing_applications(db):
+    service = ApplicationService()
+    for i in range(3):
+        await service.create(make_application(USER, i), USER)
+    backup = await export_text(service, USER, "ndjson")
+
+    again = await service.import_file(io.BytesIO(backup.encode()), "ndjson", USER)
+    await service.delete_all(USER["email"])
+    restored = await service.import_file(io.BytesIO(backup.encode()), "ndjson", USER)
+    twice = await service.import_file(io.BytesIO(backup.encode()), "ndjson", USER)
+
+    assert (again.inserted, again.failed) == (0, 3)
+    assert restored.inserted == 3
+    assert (twice.inserted, twice.failed) == (0, 3)
+    assert len(await service.get_all(USER["email"])) == 3
+
+async def test_backup_restores_email_bodies(db):
+    service = ApplicationService()
+    application = make_application(USER, logs=2)
+    application.logs[0].emailBody = "Thanks for applying to Company 0."
+    await service.create(application, USER)
+    backup = await export_text(service, USER, "ndjson")
+
+    await service.delete_all(USER["email"])
+    result = await service.import_file(io.BytesIO(backup.encode()), "ndjson", USER)
+
+    [restored] = await service.get_all(USER["email"])
+    logs = await service.get_logs(restored.id, USER["email"])
+    assert result.inserted == 1
+    assert logs[0].emailBody == "Thanks for applying to Company 0."
+    assert logs[1].emailBody is None
+
+async def test_import_rejects_dangling_email_body_refs(db):
+    service = ApplicationService()
+    application = make_application(USER, logs=1)
+    application.logs[0].emailBodyRef = "0" * 64
+
+    result = await service.import_file(io.BytesIO(application.model_dump_json().encode()), "ndjson", USER)
+
+    assert (result.inserted, result.failed) == (0, 1)
+    assert "Email body missing" in result.errors[0].error
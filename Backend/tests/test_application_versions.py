@@ -0,0 +1,65 @@
+# tests/test_application_versions.py
+import pytest
+from fastapi import HTTPException
+from app.database import init_db
+from app.models.application import Application, ApplicationPatch
+from app.services.application_service import ApplicationService
+from tests.factories import make_application
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "user-1", "name": "Test User", "email": "user@example.com"}
+
+def without_version(application: Application) -> Application:
+    """What the frontend PUTs: the fields it edits, no version."""
+    return Application(**application.model_dump(exclude={"version"}))
+
+async def test_update_without_version_increments_the_stored_version(db):
+    service = ApplicationService()
+    created = await service.create(make_application(USER), USER)
+    version = created.version
+    for _ in range(3):
+        version = (await service.patch(created.id, ApplicationPatch(version=version, notes="x"), USER["email"])).version
+
+    updated = await service.update(created.id, without_version(make_application(USER, stage="Interview")), USER["email"])
+
+    assert updated.version == 4
+    assert updated.stage == "Interview"
+    assert (await service.get_by_id(created.id, USER["email"])).version == 4
+
+async def test_update_with_stale_version_conflicts(db):
+    service = ApplicationService()
+    created = await service.create(make_application(USER), USER)
+    await service.update(created.id, without_version(make_application(USER, stage="Interview")), USER["email"])
+
+    with pytest.raises(HTTPException) as conflict:
+        await service.update(created.id, make_application(USER, stage="Offer", version=created.version), USER["email"])
+
+    assert conflict.value.status_code == 409
+    assert (await service.get_by_id(created.id, USER["email"])).stage == "Interview"
+
+async def test_update_of_missing_application_returns_none(db):
+    service = ApplicationService()
+    assert await service.update("0123456789abcdef01234567", make_application(USER), USER["email"]) is None
+
+async def test_patch_requires_the_stored_version(db):
+    service = ApplicationService()
+    created = await service.create(make_application(USER), USER)
+
+    patched = await service.patch(created.id, ApplicationPatch(version=created.version, stage="Interview"), USER["email"])
+    with pytest.raises(HTTPException) as conflict:
+        await service.patch(created.id, ApplicationPatch(version=created.version, stage="Offer"), USER["email"])
+
+    assert patched.version == created.version + 1
+    assert conflict.value.status_code == 409
+
+async def test_unversioned_applications_are_backfilled_to_version_zero(db):
+    service = ApplicationService()
+    created = await service.create(make_application(USER), USER)
+    collection = await service.get_collection()
+    await collection.update_one({"user_email": USER["email"]}, {"$unset": {"version": ""}})
+
+    await init_db()
+    patched = await service.patch(created.id, ApplicationPatch(version=0, stage="Interview"), USER["email"])
+
+    assert patched.version == 1
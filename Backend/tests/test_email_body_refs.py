@@ -0,0 +1,64 @@
+# tests/test_email_body_refs.py
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.models.application import ApplicationLog, ApplicationPatch, BulkRequest
+from app.services.application_service import ApplicationService
+from app.services.email_body_service import body_ref
+from tests.factories import make_application
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "user-1", "name": "Test User", "email": "user@example.com"}
+OTHER = {"id": "user-2", "name": "Other User", "email": "other@example.com"}
+
+def log(log_id: str, body: str = None, ref: str = None) -> ApplicationLog:
+    return ApplicationLog(
+        id=log_id, date=datetime(2024, 1, 2), toStage="Interview", message="Invited",
+        source="email", emailBody=body, emailBodyRef=ref
+    )
+
+async def test_writes_reject_refs_to_missing_or_foreign_bodies(db):
+    service = ApplicationService()
+    # Stored for another user, so the ref exists but is not this user's
+    foreign = (await service.email_bodies.store_many(OTHER["email"], ["Their email"]))[0]
+    created = await service.create(make_application(USER), USER)
+
+    with pytest.raises(HTTPException) as error:
+        await service.create(make_application(USER, 1).model_copy(update={"logs": [log("a", ref=foreign)]}), USER)
+    assert error.value.detail == "Email body missing for logs: a"
+
+    with pytest.raises(HTTPException) as error:
+        await service.update(
+            created.id, created.model_copy(update={"logs": [log("b", ref=body_ref("never stored"))]}), USER["email"]
+        )
+    assert error.value.status_code == 400
+
+    with pytest.raises(HTTPException) as error:
+        await service.patch(created.id, ApplicationPatch(version=created.version, appendLogs=[log("c", ref=foreign)]), USER["email"])
+    assert error.value.status_code == 400
+
+    request = BulkRequest.model_validate({"operations": [
+        {"op": "move_stage", "id": created.id, "stage": "Interview", "log": log("d", ref=foreign).model_dump()},
+        {"op": "move_stage", "id": created.id, "stage": "Offer", "log": log("e", body="Fine").model_dump()}
+    ]})
+    results = await service.bulk(request.operations, USER)
+    assert [r.status for r in results] == ["error", "ok"]
+    assert (await service.get_by_id(created.id, USER["email"])).stage == "Offer"
+
+async def test_conflicting_patch_stores_no_bodies(db):
+    service = ApplicationService()
+    created = await service.create(make_application(USER), USER)
+
+    with pytest.raises(HTTPException) as error:
+        await service.patch(
+            created.id, ApplicationPatch(version=created.version + 1, appendLogs=[log("a", body="Hello")]), USER["email"]
+        )
+    assert error.value.status_code == 409
+    assert await db["email_bodies"].count_documents({}) == 0
+
+    patched = await service.patch(
+        created.id, ApplicationPatch(version=created.version, appendLogs=[log("a", body="Hello")]), USER["email"]
+    )
+    assert patched.version == created.version + 1
+    assert [l.emailBody for l in await service.get_logs(created.id, USER["email"])] == ["Hello"]
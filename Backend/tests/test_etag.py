@@ -0,0 +1,28 @@
+# tests/test_etag.py
+import pytest
+from app.middleware.auth import get_current_user
+from tests.asgi import request
+
+pytestmark = pytest.mark.anyio
+
+def log_in_as(app, user_id: str, email: str) -> None:
+    user = {"id": user_id, "name": "Test User", "email": email, "created_at": None}
+    app.dependency_overrides[get_current_user] = lambda: user
+
+@pytest.mark.parametrize("url", ["/api/applications/", "/api/workflow/default"])
+async def test_etag_is_not_shared_between_accounts(db, app, url):
+    log_in_as(app, "user-a", "a@example.com")
+    await request(app, "GET", "/api/workflow/default")
+    first = await request(app, "GET", url)
+    assert "Authorization" in first.headers["vary"]
+
+    cached = await request(app, "GET", url, headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+    assert "Authorization" in cached.headers["vary"]
+
+    # Same per-user version, different account: A's cached copy must not be revalidated for B
+    log_in_as(app, "user-b", "b@example.com")
+    await request(app, "GET", "/api/workflow/default")
+    other = await request(app, "GET", url, headers={"If-None-Match": first.headers["etag"]})
+    assert other.status_code == 200
+    assert other.headers["etag"] != first.headers["etag"]
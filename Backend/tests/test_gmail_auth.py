@@ -0,0 +1,51 @@
+# tests/test_gmail_auth.py
+import httplib2
+import pytest
+from google.oauth2.credentials import Credentials
+from app.services.gmail_client_factory import gmail_client_factory
+from app.services.gmail_service import GmailService
+from tests.fake_gmail import StubGmailTransport
+
+pytestmark = pytest.mark.anyio
+
+class ProfileTransport(StubGmailTransport):
+    """Answers getProfile with profile_status."""
+    def __init__(self):
+        super().__init__()
+        self.profile_status = 200
+
+    def _respond(self, uri, body, headers):
+        body = b'{"emailAddress": "user@example.com"}' if self.profile_status == 200 else b'{"error": {}}'
+        return httplib2.Response({"status": str(self.profile_status), "content-type": "application/json"}), body
+
+@pytest.fixture
+async def linked_gmail(monkeypatch, db):
+    await db["gmail_credentials"].insert_one({"user_id": "user-1", "email": "user@example.com", "access_token": "token"})
+    await db["users"].insert_one({"id": "user-1", "email": "user@example.com", "name": "Test User"})
+    gmail = GmailService()
+    transport = ProfileTransport()
+    credentials = Credentials(token="token")
+    service = gmail_client_factory.build("gmail", "v1", credentials)
+    monkeypatch.setattr(gmail, "_get_client", lambda user_id, creds_doc: (service, credentials))
+    monkeypatch.setattr(gmail, "_authorized_http", lambda _credentials: transport)
+    return gmail, transport
+
+async def test_transient_profile_error_is_not_cached(linked_gmail):
+    gmail, transport = linked_gmail
+    transport.profile_status = 503
+
+    first = await gmail.check_auth("user-1")
+    second = await gmail.check_auth("user-1")
+    assert first["isAuthenticated"] and not first["cached"]
+    assert not second["cached"]
+
+    transport.profile_status = 200
+    assert not (await gmail.check_auth("user-1"))["cached"]
+    assert (await gmail.check_auth("user-1"))["cached"]
+
+async def test_rejected_token_unlinks_the_account(linked_gmail, db):
+    gmail, transport = linked_gmail
+    transport.profile_status = 401
+
+    assert not (await gmail.check_auth("user-1"))["isAuthenticated"]
+    assert await db["gmail_credentials"].count_documents({}) == 0
@@ -0,0 +1,51 @@
+# tests/test_gmail_batch.py
+import pytest
+from app.services.gmail_service import GmailService
+from tests.fake_gmail import StubGmailTransport, stub_gmail_client
+
+pytestmark = pytest.mark.anyio
+
+MESSAGE_IDS = [f"msg{i:03d}" for i in range(50)]
+
+def fetch_sequentially(service, transport, message_ids):
+    """The pre-batching loop: one messages().get round trip per message."""
+    return [
+        service.users().messages().get(userId="me", id=message_id, format="full").execute(http=transport)
+        for message_id in message_ids
+    ]
+
+async def test_batch_fetch_returns_messages_in_listing_order(monkeypatch):
+    gmail = GmailService()
+    transport = StubGmailTransport(MESSAGE_IDS)
+    service, credentials = stub_gmail_client(monkeypatch, gmail, transport)
+
+    messages, failures = await gmail._fetch_messages("user-1", service, credentials, MESSAGE_IDS, batch_size=50)
+
+    assert [m["id"] for m in messages] == MESSAGE_IDS
+    assert failures == []
+    assert transport.round_trips == 1
+
+async def test_batch_isolates_failed_items(monkeypatch):
+    gmail = GmailService()
+    transport = StubGmailTransport(MESSAGE_IDS, missing={"msg007", "msg031"})
+    service, credentials = stub_gmail_client(monkeypatch, gmail, transport)
+
+    messages, failures = await gmail._fetch_messages("user-1", service, credentials, MESSAGE_IDS, batch_size=20)
+
+    assert len(messages) == len(MESSAGE_IDS) - 2
+    assert sorted((f["id"], f["status"]) for f in failures) == [("msg007", 404), ("msg031", 404)]
+    assert transport.round_trips == 3
+
+async def test_batch_replaces_one_round_trip_per_message(monkeypatch):
+    gmail = GmailService()
+    transport = StubGmailTransport(MESSAGE_IDS)
+    service, credentials = stub_gmail_client(monkeypatch, gmail, transport)
+
+    sequential = fetch_sequentially(service, transport, MESSAGE_IDS)
+    assert transport.round_trips == len(MESSAGE_IDS)
+
+    transport.round_trips = 0
+    batched, _ = await gmail._fetch_messages("user-1", service, credentials, MESSAGE_IDS, batch_size=50)
+
+    assert batched == sequential
+    assert transport.round_trips == 1
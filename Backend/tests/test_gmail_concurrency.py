@@ -0,0 +1,66 @@
+# tests/test_gmail_concurrency.py
+import asyncio
+import pytest
+from app.config import settings
+from app.services.application_service import ApplicationService
+from app.services.gmail_service import GmailService
+from tests.asgi import request
+from tests.factories import make_application
+from tests.fake_gmail import StubGmailTransport, stub_gmail_client
+
+pytestmark = pytest.mark.anyio
+
+async def wait_until(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+async def test_slow_gmail_does_not_delay_applications(monkeypatch, db, app, current_user):
+    for i in range(20):
+        await ApplicationService().create(make_application(current_user, i), current_user)
+
+    gmail = GmailService()
+    message_ids = [f"msg{i}" for i in range(2 * settings.GMAIL_USER_CONCURRENCY)]
+    transport = StubGmailTransport(message_ids)
+    transport.gate.clear()
+    service, credentials = stub_gmail_client(monkeypatch, gmail, transport)
+
+    # batch_size=1 issues one blocking get per message, all held until the gate opens
+    gmail_fetch = asyncio.create_task(
+        gmail._fetch_messages(current_user["id"], service, credentials, message_ids, batch_size=1)
+    )
+    try:
+        await wait_until(lambda: transport.in_flight == settings.GMAIL_USER_CONCURRENCY)
+
+        response = await request(app, "GET", "/api/applications/")
+        assert response.status_code == 200
+        assert len(response.json()) == 20
+        assert not gmail_fetch.done()
+    finally:
+        transport.gate.set()
+
+    messages, failures = await gmail_fetch
+    assert len(messages) == len(message_ids) and failures == []
+
+async def test_message_gets_run_in_parallel_up_to_the_user_limit(monkeypatch):
+    gmail = GmailService()
+    message_ids = [f"msg{i}" for i in range(2 * settings.GMAIL_USER_CONCURRENCY)]
+    transport = StubGmailTransport(message_ids)
+    transport.gate.clear()
+    service, credentials = stub_gmail_client(monkeypatch, gmail, transport)
+
+    fetch = asyncio.create_task(
+        gmail._fetch_messages("user-1", service, credentials, message_ids, batch_size=1)
+    )
+    try:
+        await wait_until(lambda: transport.in_flight == settings.GMAIL_USER_CONCURRENCY)
+        # The rest wait for a free slot instead of piling onto the pool
+        await asyncio.sleep(0.05)
+        assert transport.in_flight == settings.GMAIL_USER_CONCURRENCY
+    finally:
+        transport.gate.set()
+
+    messages, _ = await fetch
+    assert len(messages) == len(message_ids)
+    assert transport.peak_in_flight == settings.GMAIL_USER_CONCURRENCY
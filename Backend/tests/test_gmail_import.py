@@ -0,0 +1,87 @@
+# tests/test_gmail_import.py
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from app.config import settings
+from app.models.gmail import GmailImportJobRequest
+from app.services.gmail_import_service import GmailImportService
+from app.services.gmail_service import GmailService
+from tests.fake_gmail import fake_message
+
+pytestmark = pytest.mark.anyio
+
+class StubGmail:
+    """Lists and fetches a fixed set of messages in one page."""
+    def __init__(self, message_ids):
+        self.message_ids = message_ids
+        self._builder = GmailService()
+
+    async def list_message_page(self, user_id, params):
+        return self.message_ids[:params.limit], None
+
+    async def fetch_email_details(self, user_id, user_email, message_ids, batch_size=50):
+        emails = [self._builder._build_email(fake_message(i), "body", user_id, user_email) for i in message_ids]
+        return {"emails": emails, "failed": []}
+
+def job_document(status: str, heartbeat_at: datetime, **fields) -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": "user-1",
+        "user_email": "user@example.com",
+        "request": GmailImportJobRequest(max_messages=10, page_size=10).model_dump(),
+        "status": status,
+        "processed": 4,
+        "stored": 4,
+        "failed": 0,
+        "pages": 1,
+        "errors": [],
+        "created_at": heartbeat_at,
+        "heartbeat_at": heartbeat_at,
+        "started_at": heartbeat_at,
+        "finished_at": None,
+        **fields
+    }
+
+async def wait_for_status(collection, job_id, status: str, timeout: float = 5.0) -> dict:
+    async def poll():
+        while True:
+            job = await collection.find_one({"_id": job_id})
+            if job["status"] == status:
+                return job
+            await asyncio.sleep(0.01)
+    return await asyncio.wait_for(poll(), timeout)
+
+async def test_start_adopts_jobs_stranded_by_a_dead_instance(db):
+    service = GmailImportService(StubGmail([f"msg{i}" for i in range(10)]))
+    collection = await service.get_collection()
+    now = datetime.utcnow()
+    stranded = job_document("running", now - timedelta(seconds=settings.GMAIL_IMPORT_STALE_SECONDS + 1))
+    # Still queued on an instance that is alive and keeping its heartbeat
+    alive = job_document("queued", now)
+    await collection.insert_many([stranded, alive])
+
+    try:
+        await service.start()
+        job = await wait_for_status(collection, stranded["_id"], "completed")
+    finally:
+        await service.stop()
+
+    assert job["restarts"] == 1
+    assert job["processed"] == 10 and job["stored"] == 10
+    assert (await collection.find_one({"_id": alive["_id"]}))["status"] == "queued"
+    assert await db["emails"].count_documents({}) == 10
+
+async def test_recover_claims_each_job_once(db):
+    first = GmailImportService(StubGmail([]))
+    second = GmailImportService(StubGmail([]))
+    collection = await first.get_collection()
+    await collection.insert_one(job_document("queued", datetime.utcnow() - timedelta(days=1)))
+
+    try:
+        counts = await asyncio.gather(first.recover(), second.recover())
+    finally:
+        await first.stop()
+        await second.stop()
+
+    assert sorted(counts) == [0, 1]
@@ -0,0 +1,61 @@
+# tests/test_gmail_stream.py
+import pytest
+from app.models.gmail import GmailFetchParams
+from app.services.gmail_service import GmailService, MAX_PAGE_SIZE, STREAM_CHUNK_SIZE, STREAM_WINDOW, _failure
+from tests.fake_gmail import fake_message
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def gmail(monkeypatch):
+    gmail = GmailService()
+    gmail.listed_limits = []
+    gmail.started_chunks = []
+
+    async def load_client(user_id):
+        return {"access_token": "t"}, object(), None
+
+    async def save_refreshed_token(*args):
+        pass
+
+    async def list_message_ids(user_id, service, credentials, params):
+        gmail.listed_limits.append(params.limit)
+        return [f"msg{i:03d}" for i in range(min(params.limit, 100))], None
+
+    async def get_emails(user_id, user_email, service, credentials, message_ids, batch_size):
+        gmail.started_chunks.append(message_ids)
+        emails = [gmail._build_email(fake_message(i), "body", user_id, user_email) for i in message_ids if i != "msg013"]
+        failures = [_failure("msg013", "Failed to parse message", retryable=False)] if "msg013" in message_ids else []
+        return emails, failures, 0
+
+    monkeypatch.setattr(gmail, "_load_client", load_client)
+    monkeypatch.setattr(gmail, "_save_refreshed_token", save_refreshed_token)
+    monkeypatch.setattr(gmail, "_list_message_ids", list_message_ids)
+    monkeypatch.setattr(gmail, "_get_emails", get_emails)
+    return gmail
+
+async def test_slow_reader_bounds_chunks_in_flight(gmail):
+    frames = await gmail.open_email_stream("user-1", "user@example.com", GmailFetchParams(limit=100))
+
+    await frames.__anext__()
+    assert len(gmail.started_chunks) <= STREAM_WINDOW
+
+    rest = [frame async for frame in frames]
+    assert len(gmail.started_chunks) == 100 // STREAM_CHUNK_SIZE
+    assert rest[-1]["type"] == "done"
+
+async def test_message_failures_are_not_fatal_frames(gmail):
+    frames = await gmail.open_email_stream("user-1", "user@example.com", GmailFetchParams(limit=30))
+
+    types = [frame["type"] async for frame in frames]
+
+    assert types.count("email") == 29
+    assert types.count("failed") == 1
+    assert "error" not in types
+    assert types[-1] == "done"
+
+async def test_page_size_is_clamped(gmail):
+    await gmail.open_email_stream("user-1", "user@example.com", GmailFetchParams(limit=100_000))
+    await gmail.open_email_stream("user-1", "user@example.com", GmailFetchParams(limit=0))
+
+    assert gmail.listed_limits == [MAX_PAGE_SIZE, 1]
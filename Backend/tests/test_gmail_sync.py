@@ -0,0 +1,88 @@
+# tests/test_gmail_sync.py
+import pytest
+from app.routers import gmail as gmail_router
+from app.services.gmail_service import GmailService, _failure
+from tests.asgi import request
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = "user-1"
+
+class FakeHistory:
+    """Stands in for service.users().history(), serving pre-built pages."""
+    def __init__(self, pages):
+        self.pages = pages
+
+    def users(self):
+        return self
+
+    def history(self):
+        return self
+
+    def list(self, pageToken=None, **kwargs):
+        page = self.pages[int(pageToken or 0)]
+        return type("Call", (), {"execute": lambda _self, http=None: page})()
+
+def history_record(record_id: int, *message_ids: str) -> dict:
+    return {"id": str(record_id), "messagesAdded": [{"message": {"id": i}} for i in message_ids]}
+
+@pytest.fixture
+async def gmail(monkeypatch, db):
+    gmail = GmailService()
+    await db[gmail.credentials_collection].insert_one({"user_id": USER_ID, "history_id": "100", "access_token": "t"})
+
+    async def load_client(user_id):
+        return await db[gmail.credentials_collection].find_one({"user_id": user_id}), object(), None
+
+    async def save_refreshed_token(*args):
+        pass
+
+    monkeypatch.setattr(gmail, "_load_client", load_client)
+    monkeypatch.setattr(gmail, "_save_refreshed_token", save_refreshed_token)
+    monkeypatch.setattr(gmail, "_list_history", lambda *args: (["m1", "m2"], "200", False))
+    return gmail
+
+def returning(emails, failures):
+    async def get_emails(*args):
+        return emails, failures, 0
+    return get_emails
+
+async def test_permanent_failures_are_recorded_and_skipped(monkeypatch, db, gmail):
+    monkeypatch.setattr(gmail, "_get_emails", returning(["m1"], [_failure("m2", "Failed to parse message", retryable=False)]))
+
+    result = await gmail.sync_new_emails(USER_ID, "user@example.com")
+
+    creds = await db[gmail.credentials_collection].find_one({"user_id": USER_ID})
+    assert result["historyId"] == "200"
+    assert creds["history_id"] == "200"
+    assert [m["id"] for m in creds["skipped_messages"]] == ["m2"]
+
+async def test_transient_failures_hold_the_cursor(monkeypatch, db, gmail):
+    monkeypatch.setattr(gmail, "_get_emails", returning(["m1"], [_failure("m2", "Backend Error", 503)]))
+
+    await gmail.sync_new_emails(USER_ID, "user@example.com")
+
+    creds = await db[gmail.credentials_collection].find_one({"user_id": USER_ID})
+    assert creds["history_id"] == "100"
+    assert "skipped_messages" not in creds
+
+def test_history_listing_stops_at_limit():
+    pages = [
+        {"history": [history_record(101, "a"), history_record(102, "b", "c")], "nextPageToken": "1", "historyId": "110"},
+        {"history": [history_record(103, "d")], "historyId": "110"},
+    ]
+    gmail = GmailService()
+    gmail._authorized_http = lambda credentials: None
+
+    assert gmail._list_history(FakeHistory(pages), None, "100", 2) == (["a", "b", "c"], "102", True)
+    assert gmail._list_history(FakeHistory(pages), None, "100", 50) == (["a", "b", "c", "d"], "110", False)
+
+async def test_sync_route_only_accepts_post(monkeypatch, app, current_user):
+    async def sync_new_emails(**kwargs):
+        return {"emails": [], "hasMore": False}
+    monkeypatch.setattr(gmail_router.gmail_service, "sync_new_emails", sync_new_emails)
+
+    assert (await request(app, "GET", "/api/gmail/sync")).status_code == 405
+    response = await request(app, "POST", "/api/gmail/sync?limit=10")
+    assert response.status_code == 200
+    assert response.json() == {"emails": [], "hasMore": False}
@@ -0,0 +1,59 @@
+# tests/test_mail_outbox.py
+import pytest
+from app.config import settings
+from app.services.mail_outbox_service import MailOutboxService
+from tests.fake_smtp import StubSMTPServer
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def smtp(monkeypatch):
+    with StubSMTPServer({
+        "bounce@example.com": "550 No such user",
+        "busy@example.com": "451 Try again later"
+    }) as server:
+        monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(settings, "SMTP_PORT", server.port)
+        monkeypatch.setattr(settings, "SMTP_STARTTLS", False)
+        monkeypatch.setattr(settings, "EMAIL_PASSWORD", "")
+        yield server
+
+async def test_sends_over_one_connection_and_drops_bodies(db, smtp):
+    outbox = MailOutboxService()
+    for i in range(3):
+        await outbox.enqueue(f"user{i}@example.com", "Reset", f"https://example.com/reset?token={i}")
+
+    assert await outbox.process_batch() == 3
+    await outbox.stop()
+
+    assert sorted(smtp.received) == [f"user{i}@example.com" for i in range(3)]
+    assert smtp.connections == 1
+    async for doc in db["mail_outbox"].find():
+        assert doc["status"] == "sent"
+        assert doc["body"] is None
+
+async def test_rejections_fail_only_their_message(db, smtp):
+    outbox = MailOutboxService()
+    await outbox.enqueue("bounce@example.com", "Reset", "https://example.com/reset?token=a")
+    await outbox.enqueue("busy@example.com", "Reset", "https://example.com/reset?token=b")
+
+    await outbox.enqueue("user@example.com", "Reset", "https://example.com/reset?token=c")
+
+    assert await outbox.process_batch() == 3
+    await outbox.stop()
+
+    # Rejections leave the session usable, so every message went over the first connection
+    assert smtp.connections == 1
+    assert smtp.received == ["user@example.com"]
+
+    bounced = await db["mail_outbox"].find_one({"to": "bounce@example.com"})
+    assert bounced["status"] == "failed"
+    assert bounced["attempts"] == 1
+    assert bounced["body"] is None
+    assert "550" in bounced["last_error"]
+
+    busy = await db["mail_outbox"].find_one({"to": "busy@example.com"})
+    assert busy["status"] == "pending"
+    assert busy["attempts"] == 1
+    assert busy["body"] == "https://example.com/reset?token=b"
+    assert busy["next_attempt_at"] > busy["created_at"]
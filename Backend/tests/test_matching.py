@@ -0,0 +1,35 @@
+# tests/test_matching.py
+import pytest
+from app.models.email import EmailMatchInput
+from app.services.application_service import ApplicationService
+from app.services.matching_service import MatchingService
+from tests.factories import make_application
+
+pytestmark = pytest.mark.anyio
+
+def email_from(company: str) -> EmailMatchInput:
+    return EmailMatchInput(subject=f"Your application at {company}", sender="jobs@example.com")
+
+async def best_company(matching: MatchingService, user: dict, company: str):
+    [result] = await matching.match(user["email"], [email_from(company)])
+    return result.matches[0].company if result.matches else None
+
+async def test_index_follows_edits_that_keep_last_updated(db, current_user):
+    applications = ApplicationService()
+    matching = MatchingService()
+    created = await applications.create(make_application(current_user, company="Acme Robotics"), current_user)
+    await applications.create(make_application(current_user, 5, company="Hooli"), current_user)
+    assert await best_company(matching, current_user, "Acme Robotics") == "Acme Robotics"
+
+    # The client sends the same, older lastUpdated; only the server-side seq moves
+    renamed = created.model_copy(update={"company": "Initech"})
+    await applications.update(created.id, renamed, current_user["email"])
+    assert await best_company(matching, current_user, "Acme Robotics") is None
+    assert await best_company(matching, current_user, "Initech") == "Initech"
+
+    await applications.delete(created.id, current_user["email"])
+    assert await best_company(matching, current_user, "Initech") is None
+
+    await applications.create(make_application(current_user, 1, company="Globex"), current_user)
+    await applications.delete_all(current_user["email"])
+    assert await best_company(matching, current_user, "Globex") is None
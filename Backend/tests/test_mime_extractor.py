@@ -0,0 +1,93 @@
+# tests/test_mime_extractor.py
+import base64
+import json
+import time
+from pathlib import Path
+import pytest
+from app.services.mime_extractor import extract_body
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "mime"
+CORPUS = {path.stem: json.loads(path.read_text(encoding="utf-8")) for path in sorted(CORPUS_DIR.glob("*.json"))}
+
+def soup_extract(payload: dict) -> str:
+    """The BeautifulSoup path the extractor replaced, kept here as the benchmark baseline."""
+    from bs4 import BeautifulSoup
+
+    def clean_html(html_content: str) -> str:
+        return BeautifulSoup(html_content, "html.parser").get_text(separator=" ", strip=True)
+
+    def decode(part: dict) -> str:
+        return base64.urlsafe_b64decode(part["body"]["data"] + "==").decode("UTF-8")
+
+    if payload.get("body", {}).get("data"):
+        return clean_html(decode(payload))
+    if payload.get("parts"):
+        text_content = []
+        for part in payload["parts"]:
+            if part["mimeType"] == "text/plain":
+                if part["body"].get("data"):
+                    return decode(part)
+            elif part["mimeType"] == "text/html":
+                if part["body"].get("data"):
+                    text_content.append(clean_html(decode(part)))
+            elif part["mimeType"].startswith("multipart/"):
+                text_content.append(soup_extract(part))
+        return "\n".join(filter(None, text_content))
+    return ""
+
+def html_payload(html: str) -> dict:
+    return {"mimeType": "text/html", "headers": [], "body": {"data": base64.urlsafe_b64encode(html.encode()).decode()}}
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_corpus_extraction(name):
+    sample = CORPUS[name]
+    body = extract_body(sample["payload"])
+    for phrase in sample["expected"]:
+        assert phrase in body
+    for phrase in sample["absent"]:
+        assert phrase not in body
+
+def test_matches_beautifulsoup_text_where_it_could_decode():
+    pytest.importorskip("bs4")
+    compared = 0
+    for name, sample in CORPUS.items():
+        try:
+            expected = soup_extract(sample["payload"])
+        except UnicodeDecodeError:
+            # The old path assumed UTF-8 and crashed on these
+            continue
+        body = extract_body(sample["payload"])
+        for phrase in sample["expected"]:
+            if phrase in expected:
+                assert phrase in body, name
+        compared += 1
+    assert compared >= len(CORPUS) - 3
+
+def test_size_cap_truncates_large_bodies():
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20 + "</p>"
+    payload = html_payload("<html><body>" + paragraph * 5000 + "</body></html>")
+
+    body = extract_body(payload, max_chars=10_000)
+
+    assert len(body) == 10_000
+    assert body.startswith("Lorem ipsum")
+
+@pytest.mark.benchmark
+def test_throughput_against_beautifulsoup():
+    pytest.importorskip("bs4")
+    payloads = [sample["payload"] for name, sample in CORPUS.items() if name not in ("latin1_html", "windows1252_plain")]
+    payloads *= 50
+    for payload in payloads[:len(CORPUS)]:
+        soup_extract(payload), extract_body(payload)
+
+    started = time.perf_counter()
+    for payload in payloads:
+        soup_extract(payload)
+    soup_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for payload in payloads:
+        extract_body(payload)
+    extractor_seconds = time.perf_counter() - started
+
+    assert extractor_seconds < soup_seconds
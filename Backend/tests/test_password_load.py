@@ -0,0 +1,95 @@
+# tests/test_password_load.py
+import asyncio
+import threading
+import bcrypt
+import pytest
+from app.concurrency import BlockingExecutor
+from app.config import settings
+from app.middleware import rate_limit
+from app.services import password_hasher
+from app.services.application_service import ApplicationService
+from tests.asgi import request
+from tests.factories import make_application
+
+pytestmark = pytest.mark.anyio
+
+ROUNDS = 4
+PASSWORD = "correct horse battery staple"
+
+class GatedCheck:
+    """Wraps the bcrypt check so it blocks until opened, counting how many run at once."""
+    def __init__(self, check):
+        self._check = check
+        self._lock = threading.Lock()
+        self.gate = threading.Event()
+        self.in_flight = 0
+        self.peak = 0
+
+    def __call__(self, password: str, hashed: str) -> bool:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            self.gate.wait()
+            return self._check(password, hashed)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+async def wait_until(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+async def test_queue_time_counts_toward_the_timeout():
+    executor = BlockingExecutor(max_workers=1, per_user_limit=1, timeout=5.0, name="test")
+    gate = threading.Event()
+    try:
+        busy = asyncio.create_task(executor.run(None, gate.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(None, gate.wait, timeout=0.05)
+
+        # Gave up while the only worker was still taken, not after it freed up
+        assert not busy.done()
+        gate.set()
+        assert await busy is True
+    finally:
+        gate.set()
+        executor.shutdown()
+
+async def test_logins_do_not_block_applications(monkeypatch, db, app, current_user):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", ROUNDS)
+    monkeypatch.setattr(rate_limit, "ip_limiter", rate_limit.TokenBucketLimiter(rate=1000, burst=1000, max_keys=100))
+    monkeypatch.setattr(rate_limit, "email_limiter", rate_limit.TokenBucketLimiter(rate=1000, burst=1000, max_keys=100))
+    check = GatedCheck(password_hasher._check)
+    monkeypatch.setattr(password_hasher, "_check", check)
+    for i in range(20):
+        await ApplicationService().create(make_application(current_user, i), current_user)
+
+    # Distinct accounts so the per-user limit does not serialize the burst
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=ROUNDS)).decode()
+    emails = [f"load{i}@example.com" for i in range(4 * settings.BCRYPT_MAX_WORKERS)]
+    await db["users"].insert_many([
+        {"id": f"load-{i}", "email": email, "hashed_password": hashed} for i, email in enumerate(emails)
+    ])
+
+    logins = asyncio.gather(*(
+        request(app, "POST", "/api/auth/login", {"email": email, "password": PASSWORD}) for email in emails
+    ))
+    try:
+        await wait_until(lambda: check.in_flight == settings.BCRYPT_MAX_WORKERS)
+
+        # Every worker is held and the rest of the logins are queued, yet the list is still served
+        response = await request(app, "GET", "/api/applications/")
+        assert response.status_code == 200
+        assert len(response.json()) == 20
+        assert not logins.done()
+    finally:
+        check.gate.set()
+
+    responses = await logins
+    assert [r.status_code for r in responses] == [200] * len(emails)
+    assert check.peak == settings.BCRYPT_MAX_WORKERS
@@ -0,0 +1,25 @@
+# tests/test_rate_limit.py
+import pytest
+from app.middleware import rate_limit
+from app.middleware.rate_limit import TokenBucketLimiter
+from tests.asgi import request
+
+pytestmark = pytest.mark.anyio
+
+def login(app, email: str):
+    return request(app, "POST", "/api/auth/login", {"email": email, "password": "wrong"})
+
+async def test_refused_email_does_not_drain_the_ip_bucket(monkeypatch, db, app):
+    monkeypatch.setattr(rate_limit, "ip_limiter", TokenBucketLimiter(rate=0.001, burst=3, max_keys=100))
+    monkeypatch.setattr(rate_limit, "email_limiter", TokenBucketLimiter(rate=0.001, burst=1, max_keys=100))
+
+    assert (await login(app, "victim@example.com")).status_code == 401
+    for _ in range(5):
+        response = await login(app, "victim@example.com")
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) > 0
+
+    # The IP still has the two tokens the refused attempts never took
+    assert (await login(app, "other@example.com")).status_code == 401
+    assert (await login(app, "third@example.com")).status_code == 401
+    assert (await login(app, "fourth@example.com")).status_code == 429
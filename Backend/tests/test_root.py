@@ -0,0 +1,12 @@
+# tests/test_root.py
+import pytest
+from tests.asgi import request
+
+pytestmark = pytest.mark.anyio
+
+async def test_root_does_not_expose_cache_stats(db, app):
+    response = await request(app, "GET", "/api")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert "auth_user_cache" not in response.json()
@@ -0,0 +1,77 @@
+# tests/test_sync.py
+import pytest
+from app.services.application_service import ApplicationService
+from app.services.data_version_service import DataVersionService
+from app.services.sync_service import SyncService
+from tests.factories import make_application
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "user-1", "name": "Test User", "email": "user@example.com"}
+
+async def test_write_committing_after_a_sync_is_sent_next_time(db):
+    applications = ApplicationService()
+    sync = SyncService()
+    first = await applications.create(make_application(USER, 0), USER)
+
+    # A write that reserved its seq but has not committed while the client syncs
+    async with DataVersionService().seq_lease(USER["email"]) as seq:
+        late = applications._new_document(make_application(USER, 1), USER, seq)
+        await applications.create(make_application(USER, 2), USER)
+        during = await sync.changes(USER["email"])
+        await (await applications.get_collection()).insert_one(late)
+
+    after = await sync.changes(USER["email"], during.token)
+
+    assert {a.company for a in during.applications.upserted} == {"Company 0", "Company 2"}
+    assert str(late["_id"]) in {a.id for a in after.applications.upserted}
+    assert first.id not in {a.id for a in after.applications.upserted}
+
+async def test_token_advances_once_writes_finish(db):
+    applications = ApplicationService()
+    sync = SyncService()
+    await applications.create(make_application(USER, 0), USER)
+    token = (await sync.changes(USER["email"])).token
+
+    created = await applications.create(make_application(USER, 1), USER)
+    await applications.delete(created.id, USER["email"])
+    changes = await sync.changes(USER["email"], token)
+    again = await sync.changes(USER["email"], changes.token)
+
+    assert changes.applications.deleted == [created.id]
+    assert again.applications.upserted == [] and again.applications.deleted == []
+
+async def test_failed_write_releases_its_seq(db):
+    versions = DataVersionService()
+    with pytest.raises(RuntimeError):
+        async with versions.seq_lease(USER["email"]):
+            raise RuntimeError("write failed")
+
+    assert await versions.committed_seq(USER["email"]) == 1
+
+class CountingCollection:
+    """Forwards to a collection and counts the calls made through it."""
+    def __init__(self, collection):
+        self._collection = collection
+        self.calls = []
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        return getattr(self._collection, name)
+
+async def test_write_costs_two_data_version_updates(monkeypatch, db):
+    applications = ApplicationService()
+    await applications.create(make_application(USER, 0), USER)
+    counting = CountingCollection(db["data_versions"])
+
+    async def get_collection():
+        return counting
+    monkeypatch.setattr(applications.data_versions, "get_collection", get_collection)
+    version = await applications.data_versions.get(USER["email"])
+    counting.calls.clear()
+
+    await applications.create(make_application(USER, 1), USER)
+
+    assert counting.calls == ["find_one_and_update", "update_one"]
+    assert await applications.data_versions.get(USER["email"]) == version + 1
+    assert await applications.data_versions.committed_seq(USER["email"]) == 2
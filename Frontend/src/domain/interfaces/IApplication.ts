@@ -27,6 +27,7 @@ export interface Application {
     emailId?: string;
     emailTitle?: string;
     emailBody?: string;
+    emailBodyRef?: string; // Body is stored separately; fetch it with the application's logs
   }
 
 export interface ApplicationCreate {
@@ -1,4 +1,4 @@
-import { Application } from '@/domain/interfaces/IApplication';
+import { Application, ApplicationLog } from '@/domain/interfaces/IApplication';
 
 export interface IApplicationService {
   getApplications(): Promise<Application[]>;
@@ -7,6 +7,7 @@ export interface IApplicationService {
   addApplication(application: Application): Promise<Application>;
   deleteApplication(id: string): void;
   getApplicationById(id: string): Promise<Application | undefined>;
+  getApplicationLogs(id: string): Promise<ApplicationLog[]>;
   resetAllApplications(): Promise<void>;
 }
 
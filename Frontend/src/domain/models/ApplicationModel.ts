@@ -26,6 +26,10 @@ export class ApplicationModel {
     await this.applicationService.updateApplication(applicationId, updatedApplication);
   }
 
+  async getApplicationLogs(applicationId: string): Promise<ApplicationLog[]> {
+    return this.applicationService.getApplicationLogs(applicationId);
+  }
+
   async createStageChangeLog(
     application: Application,
     newStage: string
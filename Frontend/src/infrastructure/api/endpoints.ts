@@ -4,6 +4,7 @@ export const API_ENDPOINTS = {
       BASE: '/api/applications',
       BY_ID: (id: string) => `/api/applications/${id}`,
       LOGS: '/api/applications/logs',
+      LOGS_BY_ID: (id: string) => `/api/applications/${id}/logs`,
       RESET: '/api/applications/reset/all', // New reset endpoint
   },
   WORKFLOW: {
@@ -29,6 +30,7 @@ export const API_ENDPOINTS = {
       EMAILS: '/api/gmail/emails',
       CHECK_AUTH: '/api/gmail/check-auth',
       LOGOUT: '/api/gmail/logout',
+      SYNC: '/api/gmail/sync', // POST: each call advances the stored history cursor
   },
   AUTH: {
       REGISTER: '/api/auth/register',
@@ -1,7 +1,7 @@
 // src/core/services/ApplicationService.ts
 import { injectable, inject } from 'inversify';
 import { makeObservable, observable, action } from 'mobx';
-import type { Application, ApplicationCreate } from '../../domain/interfaces/IApplication';
+import type { Application, ApplicationCreate, ApplicationLog } from '../../domain/interfaces/IApplication';
 import { IApplicationService } from '../../domain/interfaces';
 import type { IAuthService } from '../../domain/interfaces/IAuthService';
 import { ApiClient } from '../api/apiClient';
@@ -49,6 +49,16 @@ export class ApplicationService implements IApplicationService {
     }
   }
 
+  async getApplicationLogs(id: string): Promise<ApplicationLog[]> {
+    try {
+      // Unlike the application list, these logs include the email bodies
+      return await ApiClient.get<ApplicationLog[]>(API_ENDPOINTS.APPLICATIONS.LOGS_BY_ID(id));
+    } catch (error) {
+      console.error(`Failed to fetch logs of application ${id}:`, error);
+      throw error;
+    }
+  }
+
   @action
   async addApplication(applicationData: ApplicationCreate): Promise<Application> {
     try {
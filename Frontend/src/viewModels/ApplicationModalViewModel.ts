@@ -1,8 +1,8 @@
 // src/presentation/viewModels/ApplicationModalViewModel.ts
-import { makeAutoObservable, computed, action, observable } from 'mobx';
+import { makeAutoObservable, computed, action, observable, runInAction } from 'mobx';
 import { inject, injectable } from 'inversify';
 import { SERVICE_IDENTIFIERS } from '@/di/identifiers';
-import type { Application } from '@/domain/interfaces/IApplication';
+import type { Application, ApplicationLog } from '@/domain/interfaces/IApplication';
 import type { IViewModelUpdateField } from '@/domain/interfaces';
 import { ApplicationModel } from '@/domain/models/ApplicationModel';
 import { UnsavedChangesViewModel } from './UnsavedChangesViewModel';
@@ -11,6 +11,7 @@ import { UnsavedChangesViewModel } from './UnsavedChangesViewModel';
 export class ApplicationModalViewModel implements IViewModelUpdateField {
   @observable showStageSelect = false;
   @observable expandedLogs = new Set<string>();
+  @observable emailBodies = new Map<string, string>();
   @observable unsavedChanges: Partial<Application> = {};
 
   constructor(
@@ -26,14 +27,37 @@ export class ApplicationModalViewModel implements IViewModelUpdateField {
   }
 
   @action
-  toggleLogExpansion(logId: string): void {
+  toggleLogExpansion(logId: string, application?: Application): void {
     if (this.expandedLogs.has(logId)) {
       this.expandedLogs.delete(logId);
     } else {
       this.expandedLogs.add(logId);
+      const log = application?.logs.find((l) => l.id === logId);
+      if (application && log && !log.emailBody && log.emailBodyRef && !this.emailBodies.has(logId)) {
+        this.loadEmailBodies(application.id);
+      }
     }
   }
 
+  /**
+   * Fetches the email bodies of an application's logs, which the application list only references.
+   * @param applicationId The application whose logs are shown.
+   */
+  async loadEmailBodies(applicationId: string): Promise<void> {
+    try {
+      const logs = await this.applicationModel.getApplicationLogs(applicationId);
+      runInAction(() => {
+        logs.forEach((log) => log.emailBody && this.emailBodies.set(log.id, log.emailBody));
+      });
+    } catch (error) {
+      console.error('Failed to load email bodies:', error);
+    }
+  }
+
+  emailBody(log: ApplicationLog): string | undefined {
+    return log.emailBody || this.emailBodies.get(log.id);
+  }
+
   /**
    * Handles field changes by delegating tracking to UnsavedChangesViewModel.
    * @param application The current application.
@@ -140,6 +164,7 @@ export class ApplicationModalViewModel implements IViewModelUpdateField {
   reset(): void {
     this.showStageSelect = false;
     this.expandedLogs.clear();
+    this.emailBodies.clear();
     this.unsavedChanges = {};
   }
 }
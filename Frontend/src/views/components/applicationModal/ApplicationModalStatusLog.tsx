@@ -31,7 +31,7 @@ export const ApplicationModalStatusLog = observer(({
               transition-all duration-200
               ${log.emailId ? 'cursor-pointer hover:shadow-[6px_6px_12px_#111316,-6px_-6px_12px_#232732] hover:border-cyan-500/30' : ''}
             `}
-            onClick={() => log.emailId && viewModel.toggleLogExpansion(log.id)}
+            onClick={() => log.emailId && viewModel.toggleLogExpansion(log.id, updatedApplication)}
           >
             <div className="flex items-start gap-4 p-4">
               <div className="flex-shrink-0 text-right">
@@ -83,7 +83,7 @@ export const ApplicationModalStatusLog = observer(({
                   "
                 >
                   <p className="text-sm text-gray-300 leading-relaxed whitespace-pre-line">
-                    {log.emailBody}
+                    {viewModel.emailBody(log)}
                   </p>
                 </div>
               </div>